@@ -0,0 +1,173 @@
+"""
+Decode microbenchmark for market-channel frames
+
+Compares per-frame cost of the old path (json.loads + walking dicts with
+.get()) against decoder.decode with the stdlib json and orjson backends.
+
+Frames are rebuilt from recorder.py CSVs in logs/ (snapshot rows -> one
+`book` list frame, update rows sharing a timestamp -> one `price_changes`
+frame). Falls back to synthetic traffic when no recordings exist.
+
+Usage:
+    python bench_decode.py                      # all logs/orderbook_*.csv
+    python bench_decode.py logs/orderbook_btc_15m_1770000000.csv
+"""
+
+import csv
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import decoder
+
+LOG_DIR = Path("logs")
+
+
+def frames_from_csv(path: Path) -> list[str]:
+    """Rebuild raw WebSocket frames from a recorder CSV."""
+    frames = []
+    snapshot = {}  # {side_label: {"bids": [...], "asks": [...]}}
+    batch = []
+    batch_ts = None
+
+    def flush_batch():
+        if batch:
+            frames.append(json.dumps({"event_type": "price_change", "price_changes": list(batch)}))
+            batch.clear()
+
+    def flush_snapshot():
+        if snapshot:
+            frames.append(json.dumps([
+                {"event_type": "book", "asset_id": label, "bids": book["bids"], "asks": book["asks"]}
+                for label, book in snapshot.items()
+            ]))
+            snapshot.clear()
+
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            asset_id = row["side"]  # UP/DOWN stands in for the token id
+            if row["event_type"] == "snapshot":
+                flush_batch()
+                book = snapshot.setdefault(asset_id, {"bids": [], "asks": []})
+                book["bids" if row["book_side"] == "bid" else "asks"].append(
+                    {"price": row["price"], "size": row["size"]})
+                continue
+            flush_snapshot()
+            if row["timestamp"] != batch_ts:
+                flush_batch()
+                batch_ts = row["timestamp"]
+            batch.append({
+                "asset_id": asset_id, "price": row["price"], "size": row["size"],
+                "side": "BUY" if row["book_side"] == "bid" else "SELL",
+                "best_bid": row["price"], "best_ask": row["best_up_ask"] or "1",
+            })
+    flush_snapshot()
+    flush_batch()
+    return frames
+
+
+def synthetic_frames(count: int = 20000) -> list[str]:
+    """Random traffic shaped like the live feed (mostly 1-3 change price_changes frames)."""
+    rng = random.Random(7)
+    frames = []
+    for i in range(count):
+        if i % 500 == 0:
+            frames.append(json.dumps([
+                {"event_type": "book", "asset_id": asset, "timestamp": str(1770000000000 + i),
+                 "bids": [{"price": f"{p / 100:.2f}", "size": f"{rng.uniform(5, 500):.2f}"} for p in range(1, 50)],
+                 "asks": [{"price": f"{p / 100:.2f}", "size": f"{rng.uniform(5, 500):.2f}"} for p in range(51, 100)]}
+                for asset in ("UP", "DOWN")
+            ]))
+            continue
+        changes = []
+        for _ in range(rng.choice((1, 1, 2, 3))):
+            changes.append({
+                "asset_id": rng.choice(("UP", "DOWN")), "price": f"{rng.randint(1, 99) / 100:.2f}",
+                "size": f"{rng.uniform(0, 500):.2f}", "side": rng.choice(("BUY", "SELL")),
+                "hash": "%040x" % rng.getrandbits(160), "best_bid": "0.49", "best_ask": "0.51",
+            })
+        frames.append(json.dumps({"event_type": "price_change", "market": "0x" + "ab" * 32,
+                                  "price_changes": changes, "timestamp": str(1770000000000 + i)}))
+    return frames
+
+
+def legacy_decode(message: str):
+    """The pre-decoder path: json.loads then walk both shapes with .get()."""
+    if message == "PONG":
+        return None
+    try:
+        data = json.loads(message)
+    except json.JSONDecodeError:
+        return None
+    out = []
+    if isinstance(data, dict):
+        for change in data.get("price_changes", []):
+            asset_id = change.get("asset_id")
+            side = change.get("side")
+            price = change.get("price")
+            size = change.get("size")
+            if asset_id and side and price is not None:
+                out.append((asset_id, "bids" if side == "BUY" else "asks", price, size))
+        return out
+    for event in data:
+        event_type = event.get("event_type")
+        asset_id = event.get("asset_id")
+        if event_type == "book" and asset_id:
+            out.append((asset_id, event.get("bids", []), event.get("asks", [])))
+        elif event_type == "price_change" and asset_id:
+            for change in event.get("changes", []):
+                side = change.get("side")
+                price = change.get("price")
+                size = change.get("size")
+                if side and price is not None:
+                    out.append((asset_id, "bids" if side == "BUY" else "asks", price, size))
+    return out
+
+
+def bench(label: str, fn, frames: list[str], rounds: int = 5) -> float:
+    """Best-of-N per-frame cost in microseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for frame in frames:
+            fn(frame)
+        best = min(best, time.perf_counter() - start)
+    per_frame = best / len(frames) * 1e6
+    print(f"   {label:<28} {per_frame:8.2f} us/frame")
+    return per_frame
+
+
+def main():
+    paths = [Path(p) for p in sys.argv[1:]] or sorted(LOG_DIR.glob("orderbook_*.csv"))
+    frames = []
+    for path in paths:
+        frames.extend(frames_from_csv(path))
+    source = f"{len(paths)} recording(s)" if frames else "synthetic traffic"
+    if not frames:
+        frames = synthetic_frames()
+
+    print(f"\n{'='*50}")
+    print(f"DECODE BENCHMARK — {len(frames)} frames from {source}")
+    print(f"{'='*50}")
+
+    before = bench("before (json + .get walk)", legacy_decode, frames)
+
+    backend_loads = decoder._loads
+    decoder._loads = json.loads
+    after_json = bench("decoder.decode (json)", decoder.decode, frames)
+    decoder._loads = backend_loads
+
+    if decoder.JSON_BACKEND != "json":
+        after_fast = bench(f"decoder.decode ({decoder.JSON_BACKEND})", decoder.decode, frames)
+    else:
+        after_fast = after_json
+        print("   (install orjson for the fast backend)")
+
+    print(f"\n   Speedup: {before / after_fast:.2f}x (json-only: {before / after_json:.2f}x)")
+    print(f"{'='*50}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Order submission benchmark: simultaneous snipes on several markets
+
+Fires execute_snipe for N markets at the same instant against a simulated
+CLOB client (fixed signing time and post_order round trip) and reports the
+latency of the last order to complete, with submission serialized behind one
+global lock (the old behaviour) and with per-market locks.
+
+Nothing is sent to Polymarket and nothing is written to logs/trades.log.
+
+Usage:
+    python bench_submit.py                  # 3 markets, 80ms round trip
+    python bench_submit.py --markets 4 --rtt-ms 150
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+import sniper
+
+
+class SimulatedClient:
+    """Stands in for ClobClient: sleeps for signing and the post_order round trip."""
+
+    def __init__(self, sign_ms: float, rtt_ms: float):
+        self.sign = sign_ms / 1000
+        self.rtt = rtt_ms / 1000
+
+    def create_order(self, order):
+        time.sleep(self.sign)
+        return order
+
+    def post_order(self, signed_order, order_type):
+        time.sleep(self.rtt)
+        return {"success": False, "orderID": ""}  # Killed FOK: exercises reserve/release
+
+
+def simultaneous_round(labels: list[str]) -> list[float]:
+    """Submit one order per label at the same instant; per-order latency in ms, in completion order."""
+    barrier = threading.Barrier(len(labels))
+    latencies = []
+    lock = threading.Lock()
+    opportunity = {"side": "UP", "token_id": "bench", "price": 980, "limit": 990, "size": 100 * sniper.SIZE_SCALE}
+
+    def submit(label: str):
+        barrier.wait()
+        start = time.perf_counter()
+        sniper.execute_snipe(dict(opportunity), monitor_label=label)
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=submit, args=(label,)) for label in labels]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def bench(title: str, labels: list[str], rounds: int) -> float:
+    """Median latency of the last order to complete, over rounds."""
+    last = [simultaneous_round(labels)[-1] for _ in range(rounds)]
+    print(f"   {title:<28} last of {len(labels)}: p50 {statistics.median(last):7.1f} ms  max {max(last):7.1f} ms")
+    return statistics.median(last)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency of simultaneous order submission")
+    parser.add_argument("--markets", type=int, default=3, help="Orders submitted at once")
+    parser.add_argument("--rtt-ms", type=float, default=80, help="Simulated post_order round trip")
+    parser.add_argument("--sign-ms", type=float, default=3, help="Simulated order signing time")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    sniper._trading_client = SimulatedClient(args.sign_ms, args.rtt_ms)
+    sniper.log_trade = lambda *a, **k: None
+    sniper.EXECUTE_TRADES = True
+    labels = [f"BENCH-{i}" for i in range(args.markets)]
+
+    print(f"\n{'='*60}")
+    print(f"SUBMISSION BENCHMARK — {args.markets} simultaneous orders, {args.rtt_ms:.0f}ms round trip")
+    print(f"{'='*60}")
+
+    per_market = sniper._market_lock
+    global_lock = threading.Lock()
+    sniper._market_lock = lambda label: global_lock
+    before = bench("before (one global lock)", labels, args.rounds)
+    sniper._market_lock = per_market
+    after = bench("after (per-market locks)", labels, args.rounds)
+
+    print(f"\n   Last order {before / after:.2f}x faster")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
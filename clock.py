@@ -0,0 +1,108 @@
+"""
+Interval clock for Polymarket up/down markets
+
+Interval boundaries are plain multiples of the interval length in Unix time
+(5m -> 300s, 15m -> 900s; Eastern Time offsets are whole hours), so slugs,
+interval starts/ends and countdowns are integer arithmetic on the current
+time instead of building timezone-aware datetimes on every call.
+
+now() is a monotonic clock anchored to wall time once at import, so it never
+steps backwards, plus a measured offset to the exchange's server time
+(sync_server_time) so countdowns match the venue in the last seconds of an
+interval, where we trade. Shared by sniper.py, recorder.py, fade_extreme.py
+and engine.py.
+"""
+
+import time
+
+import requests
+
+SERVER_TIME_URL = "https://clob.polymarket.com/time"
+SYNC_INTERVAL = 600  # Seconds between server-offset re-measurements
+SYNC_SAMPLES = 8     # Requests per measurement (spread across sub-second phases)
+
+_ASSET_SHORT = {"bitcoin": "btc", "ethereum": "eth", "solana": "sol", "xrp": "xrp"}
+
+_anchor_wall = time.time()
+_anchor_mono = time.monotonic()
+_offset = 0.0  # Server time minus local time (seconds)
+
+
+def local_now() -> float:
+    """Local wall time from the monotonic clock (no NTP steps)."""
+    return _anchor_wall + (time.monotonic() - _anchor_mono)
+
+
+def now() -> float:
+    """Best estimate of the venue's current Unix time."""
+    return _anchor_wall + (time.monotonic() - _anchor_mono) + _offset
+
+
+def server_offset() -> float:
+    """Currently applied server-minus-local offset in seconds."""
+    return _offset
+
+
+def interval_start(interval_minutes: int, at: float | None = None) -> int:
+    """Unix timestamp of the interval containing at (default: now)."""
+    length = interval_minutes * 60
+    t = int(now() if at is None else at)
+    return t - t % length
+
+
+def interval_end(interval_minutes: int, at: float | None = None) -> int:
+    """Unix timestamp at which the interval containing at (default: now) resolves."""
+    return interval_start(interval_minutes, at) + interval_minutes * 60
+
+
+def seconds_until(timestamp: int) -> int:
+    """Whole seconds from now until timestamp, floored at 0."""
+    return max(0, timestamp - int(now()))
+
+
+def market_slug(asset: str, interval_minutes: int, start: int | None = None) -> str:
+    """Slug of the up/down market for the interval starting at start (default: current interval)."""
+    if start is None:
+        start = interval_start(interval_minutes)
+    return f"{_ASSET_SHORT.get(asset, asset)}-updown-{interval_minutes}m-{start}"
+
+
+def _fetch_server_time(url: str) -> float:
+    resp = requests.get(url, timeout=5)
+    resp.raise_for_status()
+    return float(resp.text.strip())
+
+
+def sync_server_time(url: str = SERVER_TIME_URL, samples: int = SYNC_SAMPLES) -> float | None:
+    """Measure and apply the offset to exchange server time. Returns the offset, or None on failure.
+
+    The server reports whole seconds, so each sample only bounds the offset
+    to [server - t_recv, server + 1 - t_send]. Samples taken at different
+    sub-second phases are intersected, which narrows the bound well below a
+    second; the midpoint is applied. If the bounds don't intersect (a slow or
+    bad sample) the lowest-latency sample's midpoint is used instead.
+    """
+    global _offset
+    low, high = float("-inf"), float("inf")
+    best = None  # (rtt, midpoint) of the fastest sample
+    step = 1.0 / (samples + 1)
+    for i in range(samples):
+        try:
+            sent = local_now()
+            server = _fetch_server_time(url)
+            received = local_now()
+        except Exception:
+            continue
+        low = max(low, server - received)
+        high = min(high, server + 1 - sent)
+        rtt = received - sent
+        midpoint = server + 0.5 - (sent + received) / 2
+        if best is None or rtt < best[0]:
+            best = (rtt, midpoint)
+        if i + 1 < samples:
+            time.sleep(step)  # Shift the next sample's phase within the second
+
+    if best is None:
+        return None
+    _offset = (low + high) / 2 if low <= high else best[1]
+    return _offset
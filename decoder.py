@@ -0,0 +1,129 @@
+"""
+Market-channel message decoder for Polymarket WebSocket frames
+
+Turns raw frames into compact typed events so monitors don't walk generic
+dicts with repeated .get() calls. Handles both wire shapes:
+- dict with "price_changes": [{asset_id, side, price, size, best_bid, best_ask}, ...]
+- list of events: {"event_type": "book", ...} / {"event_type": "price_change", "changes": [...]}
+decode_books() parses the CLOB REST /books response into the same BookEvents.
+
+Uses orjson (a requirement), falling back to the stdlib json module if it is missing.
+Shared by sniper.py, recorder.py and fade_extreme.py.
+"""
+
+try:
+    import orjson as _json_backend
+    JSON_BACKEND = "orjson"
+except ImportError:
+    import json as _json_backend
+    JSON_BACKEND = "json"
+
+_loads = _json_backend.loads
+_DecodeError = ValueError  # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
+
+
+class BookEvent:
+    """Full book snapshot for one token. Levels are (price, size) raw feed strings."""
+
+    __slots__ = ("asset_id", "bids", "asks", "timestamp")
+
+    def __init__(self, asset_id: str, bids: list, asks: list, timestamp: int | None):
+        self.asset_id = asset_id
+        self.bids = bids
+        self.asks = asks
+        self.timestamp = timestamp
+
+
+class PriceChange:
+    """Single price-level change. side is "bids" or "asks"; price/size are raw feed strings."""
+
+    __slots__ = ("asset_id", "side", "price", "size", "best_bid", "best_ask", "timestamp")
+
+    def __init__(self, asset_id: str, side: str, price: str, size: str,
+                 best_bid: str | None, best_ask: str | None, timestamp: int | None):
+        self.asset_id = asset_id
+        self.side = side
+        self.price = price
+        self.size = size
+        self.best_bid = best_bid
+        self.best_ask = best_ask
+        self.timestamp = timestamp
+
+
+def _parse_ts(value) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _levels(raw) -> list:
+    if not raw:
+        return []
+    return [(level["price"], level["size"]) for level in raw]
+
+
+def decode(message) -> list | None:
+    """Decode a raw frame into a list of BookEvent/PriceChange.
+
+    Returns None for PONG and undecodable frames, [] for frames with no book data.
+    """
+    if message == "PONG":
+        return None
+    try:
+        data = _loads(message)
+    except _DecodeError:
+        return None
+
+    events = []
+    if type(data) is dict:
+        append = events.append
+        ts = _parse_ts(data.get("timestamp"))
+        for change in data.get("price_changes") or ():
+            get = change.get
+            asset_id = get("asset_id")
+            side = get("side")
+            price = get("price")
+            if asset_id and side and price is not None:
+                append(PriceChange(
+                    asset_id, "bids" if side == "BUY" else "asks", price, get("size", "0"),
+                    get("best_bid"), get("best_ask"), ts,
+                ))
+        return events
+
+    if not isinstance(data, list):
+        return events
+
+    for event in data:
+        if not isinstance(event, dict):
+            continue
+        event_type = event.get("event_type")
+        asset_id = event.get("asset_id")
+        if not asset_id:
+            continue
+        ts = _parse_ts(event.get("timestamp"))
+        if event_type == "book":
+            events.append(BookEvent(asset_id, _levels(event.get("bids")), _levels(event.get("asks")), ts))
+        elif event_type == "price_change":
+            for change in event.get("changes") or ():
+                side = change.get("side")
+                price = change.get("price")
+                if side and price is not None:
+                    events.append(PriceChange(
+                        asset_id, "bids" if side == "BUY" else "asks", price, change.get("size", "0"),
+                        None, None, ts,
+                    ))
+    return events
+
+
+def decode_books(data) -> list:
+    """BookEvents from a parsed REST /books response (list of {asset_id, bids, asks, timestamp})."""
+    if not isinstance(data, list):
+        return []
+    return [
+        BookEvent(book["asset_id"], _levels(book.get("bids")), _levels(book.get("asks")), _parse_ts(book.get("timestamp")))
+        for book in data
+        if isinstance(book, dict) and book.get("asset_id")
+    ]
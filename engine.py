@@ -0,0 +1,482 @@
+"""
+asyncio engine for Polymarket monitors
+
+Hosts the sniper, order book recorder and fade-extreme monitors on a single
+event loop instead of a thread per monitor, connection, ping and refresh loop:
+- AsyncMarketFeed: async WebSocket connections (websockets) push raw frames
+  into one bounded queue; a single dispatcher task decodes and routes them to
+  monitors. A full queue stops reading from the sockets (explicit
+  backpressure), and queue depth drives the sniper's conflation check.
+- Gamma lookups go through market_cache/gamma like the threaded scripts,
+  run in a worker thread so a slow lookup never blocks the loop.
+- Timers (connection PINGs, monitor refreshes, resync deadlines) are loop
+  callbacks behind the same interface as scheduler.Scheduler.
+- One task per market ticks the same sniper.AssetMonitor lifecycle as the
+  threaded sniper; order submission (py_clob_client is blocking HTTP) runs
+  in a worker thread so the loop never stalls on the CLOB.
+
+Monitor logic is unchanged: the same SniperMonitor / OrderBookRecorder /
+FadeExtremeMonitor handlers are routed through the async feed, and the
+status table is sniper.render_status on its own thread.
+
+Usage:
+    python engine.py                   # sniper markets (sniper.MONITORED_ASSETS)
+    python engine.py --record --fade   # plus recorders and the fade backtester
+    python engine.py --no-snipe --record
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import websockets
+
+import clock
+import fade_extreme
+import feed_health
+import market_cache
+import recorder
+import sniper
+from decoder import decode
+from feed import ConnectionStats, FeedRouter, PING_INTERVAL, ReconnectBackoff
+from scheduler import PRIORITY_WORKERS
+
+FRAME_QUEUE_SIZE = 10_000  # Raw frames buffered between the sockets and the dispatcher
+
+_background_tasks = set()  # Fire-and-forget tasks: the loop only keeps weak references to them
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Start a fire-and-forget task, holding a reference until it finishes."""
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Async feed
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _AsyncFeedConnection:
+    """One async WebSocket connection and the token IDs assigned to it."""
+
+    def __init__(self, feed: "AsyncMarketFeed", index: int):
+        self.feed = feed
+        self.index = index
+        self.assets: set[str] = set()
+        self.ws = None
+        self.connected = False
+        self.last_frame = None  # monotonic time of the last market frame (or of opening)
+        self.stopped = False
+        self.backoff = ReconnectBackoff()
+        self.task = None
+        self.stats = ConnectionStats()
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._run(), name=f"feed-{self.index}")
+
+    def stop(self):
+        self.stopped = True
+        self.connected = False
+        if self.task:
+            self.task.cancel()
+
+    def reconnect(self):
+        """Drop the connection and reopen it immediately (stall recovery)."""
+        if self.ws and self.connected:
+            self.backoff.fast_reconnect = True
+            self.ws.transport.abort()  # Skip the close handshake a stalled peer won't answer
+
+    def send_operation(self, asset_ids: list, operation: str):
+        """Subscribe/unsubscribe token IDs on the live connection (no-op while disconnected)."""
+        if not self.connected or not asset_ids:
+            return
+        _spawn(self._send(json.dumps({"assets_ids": asset_ids, "operation": operation})))
+
+    async def _send(self, text: str):
+        try:
+            await self.ws.send(text)
+        except Exception:
+            pass
+
+    def _ping(self):
+        if self.connected:
+            _spawn(self._send("PING"))
+
+    async def _run(self):
+        frames = self.feed.frames
+        while not self.stopped:
+            was_up = False
+            close_code = None
+            try:
+                async with websockets.connect(self.feed.url, ping_interval=30, ping_timeout=10) as ws:
+                    self.ws = ws
+                    was_up = True
+                    self.last_frame = time.monotonic()
+                    assets, handlers = self.feed._mark_connected(self, True)
+                    if assets:
+                        await ws.send(json.dumps({"assets_ids": assets, "type": "market"}))
+                    for handler in handlers:
+                        handler.on_feed_open()
+
+                    ping = self.feed.scheduler.call_every(PING_INTERVAL, self._ping)
+                    first_arrival = self.feed._first_arrival
+                    try:
+                        async for message in ws:
+                            received = time.perf_counter()
+                            if message != "PONG":
+                                self.last_frame = time.monotonic()
+                            if first_arrival(self, message):
+                                await frames.put((received, message))  # Blocks reading while the dispatcher is behind
+                    finally:
+                        ping.cancel()
+                        close_code = ws.close_code
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                for handler in self.feed._sole_live_handlers(self):
+                    handler.on_feed_error(e)
+
+            _, handlers = self.feed._mark_connected(self, False)
+            for handler in handlers:
+                handler.on_feed_close(close_code)
+            if self.stopped:
+                break
+
+            await asyncio.sleep(self.backoff.delay(was_up))
+
+
+class AsyncMarketFeed(FeedRouter):
+    """Multiplexed market-channel feed over asyncio connections and one dispatcher task.
+
+    Must be created and used from the engine's event loop.
+    """
+
+    def __init__(self, url: str, scheduler: "LoopScheduler", num_connections: int = 1,
+                 queue_size: int = FRAME_QUEUE_SIZE, redundancy: int = 1):
+        super().__init__(url, [], redundancy)
+        self.scheduler = scheduler
+        count = max(1, num_connections, self.redundancy)
+        self._connections = [_AsyncFeedConnection(self, i) for i in range(count)]
+        self.frames = asyncio.Queue(maxsize=queue_size)  # (received perf_counter, raw frame)
+
+    def has_pending_data(self, asset_id: str) -> bool:
+        """True if a frame mentioning asset_id is queued behind the one being processed."""
+        # Raw frames are decoded only on dispatch; asset ids are long enough for a substring test
+        return any(asset_id in message for _, message in self.frames._queue)
+
+    async def dispatch_forever(self):
+        """Decode queued frames and route them to handlers."""
+        frames = self.frames
+        while True:
+            received, message = await frames.get()
+            try:
+                with self.dispatch_lock:  # Order threads reprice from the books
+                    events = decode(message)
+                    if events:
+                        self._dispatch(events, received)
+                    if self._idle_waiters and frames.empty():
+                        self._notify_idle()
+            except Exception:
+                pass  # A failing handler must not stop dispatch for every other market
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Timers
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _LoopTimer:
+    """Cancellable (optionally periodic) loop callback; mirrors scheduler.TimerHandle."""
+
+    __slots__ = ("scheduler", "callback", "args", "interval", "offload", "priority", "handle", "running")
+
+    def __init__(self, scheduler: "LoopScheduler", callback, args: tuple, interval: float | None, offload: bool,
+                 priority: bool = False):
+        self.scheduler = scheduler
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.offload = offload or priority
+        self.priority = priority
+        self.handle = None
+        self.running = False
+
+    def cancel(self):
+        if self.handle:
+            self.handle.cancel()
+            self.handle = None
+        self.scheduler._timers.discard(self)
+
+    def _arm(self, delay: float):
+        self.handle = self.scheduler.loop.call_later(delay, self._fire)
+
+    def _fire(self):
+        if self.interval is not None:
+            self._arm(self.interval)
+        else:
+            self.scheduler._timers.discard(self)
+        if self.offload:
+            if not self.running:
+                self.running = True
+                _spawn(self._run_in_thread())
+            return
+        try:
+            self.callback(*self.args)
+        except Exception:
+            pass
+
+    async def _run_in_thread(self):
+        pool = self.scheduler._priority_pool if self.priority else None  # None: the loop's default executor
+        try:
+            await self.scheduler.loop.run_in_executor(pool, self.callback, *self.args)
+        except Exception:
+            pass
+        finally:
+            self.running = False
+
+
+class LoopScheduler:
+    """scheduler.Scheduler interface backed by the event loop's own timers.
+
+    offload=True runs on the loop's default executor; priority=True on a
+    separate pool, as in scheduler.Scheduler.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self._timers = set()
+        self._priority_pool = ThreadPoolExecutor(max_workers=PRIORITY_WORKERS, thread_name_prefix="loop-priority")
+
+    def call_later(self, delay: float, callback, *args, offload: bool = False, priority: bool = False) -> _LoopTimer:
+        timer = _LoopTimer(self, callback, args, None, offload, priority)
+        self._timers.add(timer)
+        timer._arm(delay)
+        return timer
+
+    def call_every(self, interval: float, callback, *args, offload: bool = False, priority: bool = False,
+                   first_delay: float | None = None) -> _LoopTimer:
+        timer = _LoopTimer(self, callback, args, interval, offload, priority)
+        self._timers.add(timer)
+        timer._arm(interval if first_delay is None else first_delay)
+        return timer
+
+    def stats(self) -> dict:
+        """Live thread count, armed timers and loop tasks."""
+        return {
+            "threads": threading.active_count(),
+            "timers": len(self._timers),
+            "tasks": len(asyncio.all_tasks(self.loop)),
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Sniper
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class AsyncSniperMonitor(sniper.SniperMonitor):
+    """SniperMonitor whose order submission runs off the event loop."""
+
+    def _submit_snipe(self, opportunity: dict, total_secs: int, target: int) -> sniper.MonitorState:
+        """Hand the blocking FOK submission to a worker thread; the result is applied on the loop."""
+        _spawn(self._snipe_in_thread(opportunity, total_secs, target))
+        return sniper.MonitorState.ARMED
+
+    def _seed_books(self):
+        """Fetch the REST book snapshot on the scheduler's priority pool; it's applied on the loop."""
+        _spawn(self._seed_in_thread())
+
+    async def _seed_in_thread(self):
+        loop = asyncio.get_running_loop()
+        try:
+            books = await loop.run_in_executor(self.scheduler._priority_pool, feed_health.fetch_books,
+                                               sniper.CLOB_HOST, [self.up_token, self.down_token])
+        except Exception:
+            return
+        self._apply_rest_books(books)
+
+    async def _snipe_in_thread(self, opportunity: dict, total_secs: int, target: int):
+        trade_context = {
+            "time_remaining": total_secs,
+            "target_price": target,
+        }
+        try:
+            trade_result = await asyncio.to_thread(
+                sniper.execute_snipe, opportunity, target_price=target,
+                monitor_label=self.asset_label, trade_context=trade_context,
+                reprice=lambda: self._reprice(target),
+            )
+            state = self._on_snipe_result(trade_result, opportunity, total_secs)
+        finally:
+            self._attempting_snipe = False
+        self._publish(state, clock.seconds_until(self.interval_end_unix), target)
+
+
+async def run_sniper_market(lifecycle: sniper.AssetMonitor, first_delay: float = 0.0):
+    """Tick a sniper.AssetMonitor once a second on the loop; only its Gamma lookup runs in a thread."""
+    await asyncio.sleep(first_delay)
+    while True:
+        slug = lifecycle.begin()
+        if slug:
+            market, waiting_status = await asyncio.to_thread(sniper._find_open_market, slug)
+            lifecycle.finish(slug, market, waiting_status)
+        await asyncio.sleep(1)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Recorder / fade
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def run_recorder_market(feed: AsyncMarketFeed, asset: str, interval_minutes: int):
+    """Record each interval of one market (async counterpart of OrderBookRecorder.run)."""
+    rec = recorder.OrderBookRecorder(asset, interval_minutes)
+    while True:
+        try:
+            slug = recorder.generate_market_slug(asset, interval_minutes)
+            slug_timestamp = slug.split("-")[-1]
+            rec.interval_end_unix = int(slug_timestamp) + rec.interval_seconds
+            if not rec.setup_from_event(await asyncio.to_thread(recorder.fetch_market_by_slug, slug)):
+                await asyncio.sleep(5)
+                continue
+
+            rec.open_csv(slug_timestamp)
+            tokens = [rec.up_token, rec.down_token]
+            feed.subscribe(tokens, rec)
+            try:
+                while recorder.generate_market_slug(asset, interval_minutes) == slug:
+                    await asyncio.sleep(1)
+            finally:
+                feed.unsubscribe(tokens, rec)
+                rec.close_csv()
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"\n[{rec.label}] Error: {e}")
+            await asyncio.sleep(5)
+
+
+async def _settle_fade_interval(monitor, slug: str):
+    # Wait a bit for market to settle/resolve
+    await asyncio.sleep(3)
+    try:
+        event_data = await asyncio.to_thread(fade_extreme.fetch_market_by_slug, slug)
+        fade_extreme.settle_interval(monitor, fade_extreme.resolution_from_event(event_data))
+    except Exception as e:
+        fade_extreme._print_event(f"[BTC] Error settling {slug}: {e}")
+
+
+async def run_fade(feed: AsyncMarketFeed):
+    """Fade-the-extreme backtester (async counterpart of fade_extreme.monitor_btc)."""
+    fade_extreme.setup_csv()
+    current_slug = None
+    monitor = None
+
+    while True:
+        try:
+            slug = fade_extreme.generate_market_slug(fade_extreme.ASSET)
+            if slug == current_slug:
+                await asyncio.sleep(1)
+                continue
+
+            if monitor:
+                # Stop routing the ended interval; resolve it in the background
+                feed.unsubscribe([monitor.up_token, monitor.down_token], monitor)
+                fade_extreme._print_event(f"\n[BTC] Interval ended: {monitor.current_slug}")
+                _spawn(_settle_fade_interval(monitor, monitor.current_slug))
+                monitor = None
+
+            current_slug = slug
+            market, _ = sniper._open_market_from_event(await asyncio.to_thread(fade_extreme.fetch_market_by_slug, slug))
+            if not market:
+                fade_extreme._print_event(f"[BTC] Waiting for market {slug}...")
+                current_slug = None
+                await asyncio.sleep(5)
+                continue
+
+            fade_extreme._print_event(f"[BTC] Found: {market.get('question', '')[:60]}...")
+            monitor = fade_extreme.FadeExtremeMonitor(market, slug)
+            feed.subscribe([monitor.up_token, monitor.down_token], monitor)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            fade_extreme._print_event(f"[BTC] Error: {e}")
+            await asyncio.sleep(5)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Main
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def run_engine(args):
+    scheduler = LoopScheduler(asyncio.get_running_loop())
+    feed = AsyncMarketFeed(f"{sniper.WS_URL}/ws/market", scheduler, sniper.FEED_CONNECTIONS,
+                           redundancy=sniper.FEED_REDUNDANCY)
+    tasks = [asyncio.create_task(feed.dispatch_forever(), name="dispatch")]
+
+    # Align interval countdowns with the venue's clock, and keep them aligned
+    server_time_url = f"{sniper.CLOB_HOST}/time"
+    offset = await asyncio.to_thread(clock.sync_server_time, server_time_url)
+    if offset is not None:
+        print(f"🕒 Server clock offset: {offset * 1000:+.0f} ms\n")
+    scheduler.call_every(clock.SYNC_INTERVAL, clock.sync_server_time, server_time_url, offload=True)
+
+    # Resolve current and upcoming intervals in the background so boundaries hit a warm cache
+    markets = set()
+    if args.snipe:
+        markets.update(sniper.MONITORED_ASSETS)
+    if args.record:
+        markets.update(recorder.AVAILABLE_MARKETS)
+    if args.fade:
+        markets.add((fade_extreme.ASSET, 15))
+    scheduler.call_every(market_cache.PREFETCH_INTERVAL, market_cache.get_cache().prefetch, sorted(markets),
+                         offload=True, first_delay=0)
+
+    if args.snipe:
+        if sniper.EXECUTE_TRADES:
+            try:
+                print("⚡ Pre-warming trading client...")
+                await asyncio.to_thread(sniper.get_trading_client)
+                print("✅ Trading client ready!\n")
+            except Exception as e:
+                print(f"❌ Failed to init trading client: {e}\n")
+            sniper._credentials.start(scheduler)
+        for i, (asset, interval) in enumerate(sniper.MONITORED_ASSETS):
+            lifecycle = sniper.AssetMonitor(asset, interval, scheduler, feed=feed, monitor_cls=AsyncSniperMonitor)
+            tasks.append(asyncio.create_task(run_sniper_market(lifecycle, first_delay=0.5 * i)))  # Stagger starts to avoid API burst
+        # The renderer only reads published snapshots and stats; a thread keeps redraws off the loop
+        threading.Thread(target=sniper.render_status, args=(scheduler, feed), daemon=True, name="render").start()
+
+    if args.record:
+        for asset, interval in recorder.AVAILABLE_MARKETS:
+            tasks.append(asyncio.create_task(run_recorder_market(feed, asset, interval)))
+
+    if args.fade:
+        tasks.append(asyncio.create_task(run_fade(feed), name="fade"))
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        feed.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Polymarket monitors on a single asyncio event loop")
+    parser.add_argument("--no-snipe", dest="snipe", action="store_false", help="Don't run the sniper")
+    parser.add_argument("--record", action="store_true", help="Record all recorder markets to CSV")
+    parser.add_argument("--fade", action="store_true", help="Run the fade-extreme backtester")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_engine(args))
+    except KeyboardInterrupt:
+        sniper.print_stopped()
+
+
+if __name__ == "__main__":
+    main()
@@ -14,17 +14,21 @@ import json
 import time
 import threading
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from websocket import WebSocketApp
 
-import requests
 from dotenv import load_dotenv
 
+import clock
+import market_cache
+from decoder import PriceChange, decode
+from orderbook import OrderBook, PRICE_SCALE, price_to_ticks, ticks_to_price
+from scheduler import get_scheduler
+
 load_dotenv()
 
 # ── API Configuration ────────────────────────────────────────────────────────
-GAMMA_HOST = "https://gamma-api.polymarket.com"
 WS_URL = "wss://ws-subscriptions-clob.polymarket.com"
 
 # ── Strategy Configuration ───────────────────────────────────────────────────
@@ -34,6 +38,8 @@ MIN_MINUTES_REMAINING = 5      # Don't fade if <5 min left
 SIMULATED_SIZE = 50            # $50 USDC per simulated trade
 PROFIT_TARGET_PCT = 10         # % profit target to exit (e.g., 50% = sell at 1.5x entry)
 
+EXTREME_THRESHOLD_TICKS = price_to_ticks(EXTREME_THRESHOLD)
+
 # ── Globals ──────────────────────────────────────────────────────────────────
 _print_lock = threading.Lock()
 _status_line = ""
@@ -61,47 +67,33 @@ def _print_event(msg: str):
             print(f"\r{_status_line}\033[K", end="", flush=True)
 
 
+try:
+    _ET = ZoneInfo("America/New_York")
+except Exception:
+    _ET = timezone(timedelta(hours=-5))  # EST
+
+
 def get_current_et_time():
-    try:
-        return datetime.now(ZoneInfo("America/New_York"))
-    except Exception:
-        from datetime import timezone
-        utc_now = datetime.now(timezone.utc)
-        return utc_now + timedelta(hours=-5)
+    """Current Eastern Time (display/log timestamps only; interval math uses clock)."""
+    return datetime.fromtimestamp(clock.now(), _ET)
 
 
 def get_15m_interval_timestamp() -> int:
-    et_now = get_current_et_time()
-    minute = (et_now.minute // 15) * 15
-    interval_time = et_now.replace(minute=minute, second=0, microsecond=0)
-    return int(interval_time.timestamp())
+    return clock.interval_start(15)
 
 
 def get_minutes_remaining() -> float:
-    et_now = get_current_et_time()
-    minute = (et_now.minute // 15) * 15
-    interval_end = et_now.replace(minute=minute, second=0, microsecond=0) + timedelta(minutes=15)
-    return max(0, (interval_end - et_now).total_seconds() / 60)
+    now = clock.now()
+    return max(0, (clock.interval_end(15, now) - now) / 60)
 
 
 def generate_market_slug(base: str = "bitcoin") -> str:
-    base_short = {"bitcoin": "btc", "ethereum": "eth", "solana": "sol", "xrp": "xrp"}.get(base, base)
-    return f"{base_short}-updown-15m-{get_15m_interval_timestamp()}"
+    return clock.market_slug(base, 15)
 
 
 def fetch_market_by_slug(slug: str) -> dict | None:
     try:
-        resp = requests.get(f"{GAMMA_HOST}/events", params={"slug": slug, "limit": 1}, timeout=10)
-        if resp.status_code == 200:
-            data = resp.json()
-            if data:
-                return data[0]
-        resp = requests.get(f"{GAMMA_HOST}/markets", params={"slug": slug, "limit": 1}, timeout=10)
-        if resp.status_code == 200:
-            data = resp.json()
-            if data:
-                return {"title": data[0].get("question", ""), "markets": [data[0]], "slug": slug}
-        return None
+        return market_cache.get_event(slug)
     except Exception as e:
         _print_event(f"Error fetching market: {e}")
         return None
@@ -160,18 +152,19 @@ class FadeExtremeMonitor:
         self.up_token = self.token_ids[self.up_idx] if len(self.token_ids) > self.up_idx else None
         self.down_token = self.token_ids[self.down_idx] if len(self.token_ids) > self.down_idx else None
 
-        # Order book state
-        self.orderbooks: dict = {}
-        self.up_price = 0.0
-        self.up_size = 0.0
-        self.down_price = 0.0
-        self.down_size = 0.0
+        # Order book state (best asks: prices in ticks, sizes in size units)
+        self.orderbooks: dict[str, OrderBook] = {}
+        self.up_price = 0
+        self.up_size = 0
+        self.down_price = 0
+        self.down_size = 0
 
         # State
         self.ws = None
         self.running = False
         self.stopped = False
         self.warmed_up = False
+        self._ping_timer = None
 
         # Tracking for this interval
         self.logged_this_interval: set = set()  # ("UP",) or ("DOWN",) — dedupe
@@ -194,25 +187,24 @@ class FadeExtremeMonitor:
         ws.send(json.dumps(subscribe_msg))
 
         self.running = True
+        self._cancel_ping()
+        self._ping_timer = get_scheduler().call_every(10, self._ping, ws)
 
-        def ping_loop():
-            while self.running:
-                try:
-                    ws.send("PING")
-                    time.sleep(10)
-                except Exception:
-                    break
+    def _ping(self, ws):
+        try:
+            ws.send("PING")
+        except Exception:
+            pass
 
-        threading.Thread(target=ping_loop, daemon=True).start()
+    def _cancel_ping(self):
+        if self._ping_timer:
+            self._ping_timer.cancel()
+            self._ping_timer = None
 
     def on_message(self, ws, message):
-        if message == "PONG":
-            return
-        try:
-            data = json.loads(message)
-            self._process_message(data)
-        except json.JSONDecodeError:
-            pass
+        events = decode(message)
+        if events:
+            self.process_events(events)
 
     def on_error(self, ws, error):
         _print_event(f"[BTC] WS error: {error}")
@@ -220,62 +212,50 @@ class FadeExtremeMonitor:
     def on_close(self, ws, code, msg):
         _print_event(f"[BTC] WS closed (code={code})")
         self.running = False
+        self._cancel_ping()
 
-    # ── Message processing ────────────────────────────────────────────────
+    # ── Shared-feed handler hooks ──────────────────────────────────────────
 
-    def _process_message(self, data):
-        if isinstance(data, dict):
-            for change in data.get("price_changes", []):
-                asset_id = change.get("asset_id")
-                side = change.get("side")
-                price = change.get("price")
-                size = change.get("size")
-                if asset_id and side and price is not None:
-                    if asset_id not in self.orderbooks:
-                        self.orderbooks[asset_id] = {"bids": [], "asks": []}
-                    book_side = "bids" if side == "BUY" else "asks"
-                    self._update_book_level(asset_id, book_side, price, size)
-            if data.get("price_changes"):
-                self.warmed_up = True
-                self._check_extreme()
-            return
+    def on_feed_open(self):
+        self.warmed_up = False
+        self.running = True
 
-        if not isinstance(data, list):
-            return
+    def on_feed_error(self, error):
+        _print_event(f"[BTC] WS error: {error}")
+
+    def on_feed_close(self, code):
+        _print_event(f"[BTC] WS closed (code={code})")
+        self.running = False
+
+    # ── Message processing ────────────────────────────────────────────────
 
-        for event in data:
-            etype = event.get("event_type")
-            asset_id = event.get("asset_id")
-            if etype == "book" and asset_id:
-                self.orderbooks[asset_id] = {
-                    "bids": event.get("bids", []),
-                    "asks": event.get("asks", []),
-                }
-                self._check_extreme()
-            elif etype == "price_change" and asset_id:
-                if asset_id not in self.orderbooks:
-                    self.orderbooks[asset_id] = {"bids": [], "asks": []}
-                for change in event.get("changes", []):
-                    side = change.get("side")
-                    price = change.get("price")
-                    size = change.get("size")
-                    if side and price is not None:
-                        book_side = "bids" if side == "BUY" else "asks"
-                        self._update_book_level(asset_id, book_side, price, size)
-                self.warmed_up = True
-                self._check_extreme()
-
-    def _update_book_level(self, asset_id: str, side: str, price: str, size: str):
-        book = self.orderbooks.get(asset_id, {"bids": [], "asks": []})
-        levels = [l for l in book.get(side, []) if l.get("price") != price]
-        if float(size) > 0:
-            levels.append({"price": price, "size": size})
-        if side == "bids":
-            levels.sort(key=lambda x: float(x["price"]), reverse=True)
-        else:
-            levels.sort(key=lambda x: float(x["price"]))
-        book[side] = levels
-        self.orderbooks[asset_id] = book
+    def process_events(self, events: list):
+        """Apply decoded book events (also called by a shared feed)."""
+        # _check_extreme only runs when the top of book moved (or on warmup)
+        top_moved = False
+        saw_change = False
+        for event in events:
+            asset_id = event.asset_id
+            if type(event) is PriceChange:
+                top_moved |= self._update_book_level(asset_id, event.side, event.price, event.size)
+                saw_change = True
+            else:
+                book = self.orderbooks.get(asset_id)
+                if book is None:
+                    book = self.orderbooks[asset_id] = OrderBook()
+                top_moved |= book.load_snapshot(event.bids, event.asks)
+
+        was_warm = self.warmed_up
+        if saw_change:
+            self.warmed_up = True
+        if top_moved or self.warmed_up != was_warm:
+            self._check_extreme()
+
+    def _update_book_level(self, asset_id: str, side: str, price: str, size: str) -> bool:
+        book = self.orderbooks.get(asset_id)
+        if book is None:
+            book = self.orderbooks[asset_id] = OrderBook()
+        return book.update_level(side, price, size)
 
     # ── Extreme detection ─────────────────────────────────────────────────
 
@@ -283,22 +263,22 @@ class FadeExtremeMonitor:
         if not self.up_token or not self.down_token:
             return
 
-        up_asks = self.orderbooks.get(self.up_token, {}).get("asks", [])
-        down_asks = self.orderbooks.get(self.down_token, {}).get("asks", [])
-        if not up_asks or not down_asks:
+        up_book = self.orderbooks.get(self.up_token)
+        down_book = self.orderbooks.get(self.down_token)
+        up_ask = up_book.best_ask() if up_book else None
+        down_ask = down_book.best_ask() if down_book else None
+        if not up_ask or not down_ask:
             return
 
-        self.up_price = float(up_asks[0]["price"])
-        self.up_size = float(up_asks[0]["size"])
-        self.down_price = float(down_asks[0]["price"])
-        self.down_size = float(down_asks[0]["size"])
+        self.up_price, self.up_size = up_ask
+        self.down_price, self.down_size = down_ask
 
         minutes_left = get_minutes_remaining()
         et_now = get_current_et_time()
 
         # Stale data check
         price_sum = self.up_price + self.down_price
-        prices_valid = price_sum <= 1.15
+        prices_valid = price_sum <= price_to_ticks(1.15)
 
         # Status line
         win_str = f"{self.wins}/{self.total_resolved}" if self.total_resolved > 0 else "0/0"
@@ -306,7 +286,7 @@ class FadeExtremeMonitor:
         status = (
             f"[{et_now.strftime('%H:%M:%S')}] [BTC] "
             f"{minutes_left:.1f}min | "
-            f"UP ${self.up_price:.2f} | DN ${self.down_price:.2f} | "
+            f"UP ${ticks_to_price(self.up_price):.2f} | DN ${ticks_to_price(self.down_price):.2f} | "
             f"Logged: {self.total_logged} | {active_str} | Wins: {win_str} | PnL: ${self.total_pnl:.2f}"
         )
         _update_status(status)
@@ -322,12 +302,12 @@ class FadeExtremeMonitor:
             return  # Too close to resolution
 
         # Check UP extreme
-        if self.up_price >= EXTREME_THRESHOLD and "UP" not in self.logged_this_interval:
+        if self.up_price >= EXTREME_THRESHOLD_TICKS and "UP" not in self.logged_this_interval:
             self._log_opportunity("UP", self.up_price, "DOWN", self.down_price, minutes_left)
             self.logged_this_interval.add("UP")
 
         # Check DOWN extreme
-        if self.down_price >= EXTREME_THRESHOLD and "DOWN" not in self.logged_this_interval:
+        if self.down_price >= EXTREME_THRESHOLD_TICKS and "DOWN" not in self.logged_this_interval:
             self._log_opportunity("DOWN", self.down_price, "UP", self.up_price, minutes_left)
             self.logged_this_interval.add("DOWN")
 
@@ -339,23 +319,17 @@ class FadeExtremeMonitor:
             target_price = pos["target_sell_price"]
 
             # Get current bid price for the fade side (what we'd sell at)
-            if fade_side == "UP":
-                token = self.up_token
-                bids = self.orderbooks.get(token, {}).get("bids", [])
-                current_bid = float(bids[0]["price"]) if bids else 0
-            else:
-                token = self.down_token
-                bids = self.orderbooks.get(token, {}).get("bids", [])
-                current_bid = float(bids[0]["price"]) if bids else 0
+            token = self.up_token if fade_side == "UP" else self.down_token
+            book = self.orderbooks.get(token)
+            current_bid = book.best_bid_price() if book else 0
 
             if current_bid >= target_price:
                 # Target hit! Calculate PnL and log
                 buy_price = pos["fade_buy_price"]
-                shares = SIMULATED_SIZE / buy_price
-                pnl = shares * current_bid - SIMULATED_SIZE
+                pnl = SIMULATED_SIZE * current_bid / buy_price - SIMULATED_SIZE
 
                 pos["row"]["exit_type"] = "TARGET_HIT"
-                pos["row"]["exit_price"] = f"{current_bid:.2f}"
+                pos["row"]["exit_price"] = f"{ticks_to_price(current_bid):.2f}"
                 pos["row"]["resolution"] = "N/A"
                 pos["row"]["pnl"] = f"{pnl:.2f}"
 
@@ -367,31 +341,32 @@ class FadeExtremeMonitor:
                 self.total_pnl += pnl
 
                 _print_event(
-                    f"   TARGET HIT! {fade_side} reached ${current_bid:.2f} "
-                    f"(target: ${target_price:.2f}) | PnL: ${pnl:.2f}"
+                    f"   TARGET HIT! {fade_side} reached ${ticks_to_price(current_bid):.2f} "
+                    f"(target: ${ticks_to_price(target_price):.2f}) | PnL: ${pnl:.2f}"
                 )
             else:
                 still_active.append(pos)
 
         self.active_positions = still_active
 
-    def _log_opportunity(self, extreme_side: str, extreme_price: float,
-                         fade_side: str, fade_buy_price: float, minutes_left: float):
+    def _log_opportunity(self, extreme_side: str, extreme_price: int,
+                         fade_side: str, fade_buy_price: int, minutes_left: float):
+        """Log a fade opportunity. Prices are in ticks."""
         et_now = get_current_et_time()
         timestamp = et_now.strftime("%Y-%m-%d %H:%M:%S")
 
-        # Calculate target sell price (entry + profit target %)
-        target_sell_price = fade_buy_price * (1 + PROFIT_TARGET_PCT / 100)
+        # Calculate target sell price in ticks (entry + profit target %, rounded up)
+        target_sell_price = -(-fade_buy_price * (100 + PROFIT_TARGET_PCT) // 100)
 
         row = {
             "timestamp": timestamp,
             "interval_slug": self.current_slug,
             "minutes_remaining": f"{minutes_left:.1f}",
             "extreme_side": extreme_side,
-            "extreme_price": f"{extreme_price:.2f}",
+            "extreme_price": f"{ticks_to_price(extreme_price):.2f}",
             "fade_side": fade_side,
-            "fade_buy_price": f"{fade_buy_price:.2f}",
-            "target_sell_price": f"{target_sell_price:.2f}",
+            "fade_buy_price": f"{ticks_to_price(fade_buy_price):.2f}",
+            "target_sell_price": f"{ticks_to_price(target_sell_price):.2f}",
             "exit_type": "",       # "TARGET_HIT" or "RESOLUTION"
             "exit_price": "",      # actual exit price
             "resolution": "",      # which side won (if held to resolution)
@@ -412,9 +387,9 @@ class FadeExtremeMonitor:
             f"\n{'='*50}\n"
             f"FADE EXTREME DETECTED\n"
             f"{'='*50}\n"
-            f"   Extreme: {extreme_side} @ ${extreme_price:.2f}\n"
-            f"   Fade:    {fade_side} @ ${fade_buy_price:.2f}\n"
-            f"   Target:  ${target_sell_price:.2f} ({PROFIT_TARGET_PCT}% profit)\n"
+            f"   Extreme: {extreme_side} @ ${ticks_to_price(extreme_price):.2f}\n"
+            f"   Fade:    {fade_side} @ ${ticks_to_price(fade_buy_price):.2f}\n"
+            f"   Target:  ${ticks_to_price(target_sell_price):.2f} ({PROFIT_TARGET_PCT}% profit)\n"
             f"   Time:    {minutes_left:.1f} min remaining\n"
             f"   Slug:    {self.current_slug}\n"
             f"{'='*50}"
@@ -432,8 +407,7 @@ class FadeExtremeMonitor:
 
             if fade_side == winning_side:
                 # Win: shares * $1 - cost
-                shares = SIMULATED_SIZE / fade_buy_price
-                pnl = shares * 1.0 - SIMULATED_SIZE
+                pnl = SIMULATED_SIZE * PRICE_SCALE / fade_buy_price - SIMULATED_SIZE
                 row["exit_price"] = "1.00"
                 self.wins += 1
             else:
@@ -506,6 +480,7 @@ class FadeExtremeMonitor:
     def stop(self):
         self.stopped = True
         self.running = False
+        self._cancel_ping()
         if self.ws:
             self.ws.close()
 
@@ -525,8 +500,12 @@ class FadeExtremeMonitor:
 
 def determine_resolution(slug: str) -> str | None:
     """Fetch market and determine which side won (resolved to $1)."""
+    return resolution_from_event(fetch_market_by_slug(slug))
+
+
+def resolution_from_event(event_data: dict | None) -> str | None:
+    """Determine which side won (resolved to $1) from a Gamma event."""
     try:
-        event_data = fetch_market_by_slug(slug)
         if not event_data:
             return None
 
@@ -565,9 +544,29 @@ def determine_resolution(slug: str) -> str | None:
         return None
 
 
+def settle_interval(monitor: FadeExtremeMonitor, winner: str | None):
+    """Resolve the ended interval's open positions (UNKNOWN if the winner isn't known yet)."""
+    if winner:
+        _print_event(f"[BTC] Resolution: {winner} won")
+        monitor.resolve_pending(winner)
+        return
+
+    _print_event(f"[BTC] Could not determine resolution (market may not be settled yet)")
+    # Still resolve as unknown — mark as N/A
+    for pos in monitor.active_positions:
+        pos["row"]["exit_type"] = "RESOLUTION"
+        pos["row"]["resolution"] = "UNKNOWN"
+        pos["row"]["exit_price"] = "N/A"
+        pos["row"]["pnl"] = "0"
+        append_opportunity(pos["row"])
+    monitor.active_positions.clear()
+
+
 def monitor_btc():
     """Main monitoring loop."""
     setup_csv()
+    get_scheduler().call_every(market_cache.PREFETCH_INTERVAL, market_cache.get_cache().prefetch, [(ASSET, 15)],
+                               offload=True, first_delay=0)
 
     current_slug = None
     monitor = None
@@ -588,20 +587,7 @@ def monitor_btc():
                     time.sleep(3)
 
                     # Determine winner
-                    winner = determine_resolution(current_slug)
-                    if winner:
-                        _print_event(f"[BTC] Resolution: {winner} won")
-                        monitor.resolve_pending(winner)
-                    else:
-                        _print_event(f"[BTC] Could not determine resolution (market may not be settled yet)")
-                        # Still resolve as unknown — mark as N/A
-                        for pos in monitor.active_positions:
-                            pos["row"]["exit_type"] = "RESOLUTION"
-                            pos["row"]["resolution"] = "UNKNOWN"
-                            pos["row"]["exit_price"] = "N/A"
-                            pos["row"]["pnl"] = "0"
-                            append_opportunity(pos["row"])
-                        monitor.active_positions.clear()
+                    settle_interval(monitor, determine_resolution(current_slug))
 
                     monitor.stop()
                     time.sleep(1)
@@ -0,0 +1,454 @@
+"""
+Shared market-channel WebSocket feed for Polymarket monitors
+
+One (or a small configurable number of) WebSocket connections carry every
+monitored market instead of one connection per monitor. Monitors subscribe
+their token IDs with a handler; decoded events are routed to handlers by
+asset_id through a dict dispatch table. Several handlers may share a token
+(e.g. the sniper and the recorder on the same market): each gets every
+event, and the token is only unsubscribed on the wire when its last handler
+leaves. Tokens are added and removed on the
+live connection as intervals roll, so boundaries don't reconnect.
+Each connection's PINGs are a scheduler timer cancelled when it drops.
+
+With redundancy=2 every token is subscribed on two independent connections
+and frames are deduplicated on arrival: the first copy is applied, later
+copies are dropped before decoding and only measured (how far behind the
+first they arrived), so a slow or stalled socket never delays the book.
+Handlers see a close only when no connection carrying their tokens is up.
+A book snapshot only one connection receives (it reconnected, say) is
+dropped if it is older than what the other connection already delivered.
+reconnect() drops a connection that has gone silent and reopens it without
+backoff; silence() tells a silent connection apart from a quiet market (see
+feed_health for the stall detection driving both).
+
+Handlers implement:
+    process_events(events)   # decoded events for the handler's tokens, one call per frame
+    on_feed_open()           # connection carrying the handler's tokens (re)connected
+    on_feed_close(code)      # that connection dropped (it reconnects on its own)
+    on_feed_error(error)
+    on_feed_idle()           # only after defer_until_idle(): buffered frames have been drained
+"""
+
+import json
+import select
+import threading
+import time
+from collections import OrderedDict, deque
+from websocket import WebSocketApp
+
+from decoder import BookEvent, decode
+from scheduler import Scheduler, get_scheduler
+
+PING_INTERVAL = 10  # Seconds between application-level PINGs
+MAX_BACKOFF = 30    # Cap on reconnect backoff (seconds)
+DEDUP_WINDOW = 4096  # Recent frames remembered for first-arrival deduplication
+LAG_SAMPLES = 1000   # Per-connection lag samples kept for percentiles
+
+
+def socket_has_pending_data(ws) -> bool:
+    """True if more frames are already buffered on a WebSocketApp (TLS buffer or kernel queue)."""
+    try:
+        sock = ws.sock.sock
+        if hasattr(sock, "pending") and sock.pending():
+            return True
+        readable, _, _ = select.select([sock], [], [], 0)
+        return bool(readable)
+    except Exception:
+        return False
+
+
+class ConnectionStats:
+    """Per-connection arrival statistics in redundant mode."""
+
+    __slots__ = ("frames", "first", "lags")
+
+    def __init__(self):
+        self.frames = 0  # Frames received (including duplicates)
+        self.first = 0   # Frames this connection delivered first
+        self.lags = deque(maxlen=LAG_SAMPLES)  # Seconds behind the first copy, for frames it lost
+
+    def summary(self) -> str:
+        """e.g. "first 63% | lag p50 1.2ms p99 8.4ms"."""
+        share = self.first / self.frames * 100 if self.frames else 0.0
+        if not self.lags:
+            return f"first {share:.0f}%"
+        lags = sorted(self.lags)
+        p50 = lags[len(lags) // 2] * 1000
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000
+        return f"first {share:.0f}% | lag p50 {p50:.1f}ms p99 {p99:.1f}ms"
+
+
+class ReconnectBackoff:
+    """Delay before reopening a dropped connection (shared by the threaded and asyncio feeds)."""
+
+    __slots__ = ("retry_count", "fast_reconnect")
+
+    def __init__(self):
+        self.retry_count = 0
+        self.fast_reconnect = False  # Dropped on purpose (stall): reopen without backoff
+
+    def delay(self, was_up: bool) -> float:
+        """Seconds to wait after a connection attempt ends; was_up if it opened."""
+        # Only count as retry if connection failed; one that ran and later dropped resets the backoff
+        self.retry_count = 0 if was_up else self.retry_count + 1
+        if self.fast_reconnect:
+            self.fast_reconnect = False
+            return 0
+        return min(2 ** self.retry_count, MAX_BACKOFF)
+
+
+class _FeedConnection:
+    """One WebSocket connection and the token IDs assigned to it."""
+
+    def __init__(self, feed: "FeedRouter", index: int):
+        self.feed = feed
+        self.index = index
+        self.assets: set[str] = set()
+        self.ws = None
+        self.connected = False
+        self.last_frame = None  # monotonic time of the last market frame (or of opening)
+        self.was_up = False  # Connection opened since the last run_forever started
+        self.backoff = ReconnectBackoff()
+        self.stopped = False
+        self.thread = None
+        self.ping_timer = None
+        self.stats = ConnectionStats()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True, name=f"feed-{self.index}")
+            self.thread.start()
+
+    def stop(self):
+        self.stopped = True
+        self.connected = False
+        self._cancel_ping()
+        if self.ws:
+            self.ws.close()
+
+    def reconnect(self):
+        """Drop the connection and reopen it immediately (stall recovery)."""
+        if self.ws and self.connected:
+            self.backoff.fast_reconnect = True
+            self.ws.close(timeout=0)  # Don't wait for a close handshake a stalled peer won't answer
+
+    def send_operation(self, asset_ids: list, operation: str):
+        """Subscribe/unsubscribe token IDs on the live connection (no-op while disconnected)."""
+        if not self.connected or not asset_ids:
+            return
+        try:
+            self.ws.send(json.dumps({"assets_ids": asset_ids, "operation": operation}))
+        except Exception:
+            pass
+
+    def _run(self):
+        while not self.stopped:
+            self.ws = WebSocketApp(
+                self.feed.url,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+                on_open=self._on_open,
+            )
+            self.ws.run_forever(ping_interval=30, ping_timeout=10)
+            self._cancel_ping()
+            if self.stopped:
+                break
+
+            delay = self.backoff.delay(self.was_up)
+            self.was_up = False
+            time.sleep(delay)
+
+    def _on_open(self, ws):
+        self.was_up = True
+        self.last_frame = time.monotonic()
+        assets, handlers = self.feed._mark_connected(self, True)
+        if assets:
+            ws.send(json.dumps({"assets_ids": assets, "type": "market"}))
+
+        self._cancel_ping()
+        self.ping_timer = self.feed.scheduler.call_every(PING_INTERVAL, self._ping, ws)
+        for handler in handlers:
+            handler.on_feed_open()
+
+    def _ping(self, ws):
+        try:
+            ws.send("PING")
+        except Exception:
+            pass
+
+    def _cancel_ping(self):
+        if self.ping_timer:
+            self.ping_timer.cancel()
+            self.ping_timer = None
+
+    def _on_message(self, ws, message):
+        received = time.perf_counter()
+        if message != "PONG":
+            self.last_frame = time.monotonic()
+        feed = self.feed
+        with feed.dispatch_lock:  # One frame at a time across connections, in first-arrival order
+            if not feed._first_arrival(self, message):
+                return
+            events = decode(message)
+            if events:
+                feed._dispatch(events, received)
+            if feed._idle_waiters and not socket_has_pending_data(ws):
+                feed._notify_idle()
+
+    def _on_error(self, ws, error):
+        for handler in self.feed._sole_live_handlers(self):
+            handler.on_feed_error(error)
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        self._cancel_ping()
+        _, handlers = self.feed._mark_connected(self, False)
+        for handler in handlers:
+            handler.on_feed_close(close_status_code)
+
+
+class FeedRouter:
+    """Token subscriptions and O(1) asset_id -> handlers dispatch over a set of connections.
+
+    Connections provide: index, assets (set), connected (bool), last_frame
+    (monotonic time of the last market frame), stats (ConnectionStats),
+    start(), stop(), reconnect() and send_operation(asset_ids, operation).
+    They flip connected through _mark_connected and notify the handlers it returns,
+    and pass each frame through _first_arrival then _dispatch, one frame at a time.
+    """
+
+    def __init__(self, url: str, connections: list, redundancy: int = 1):
+        self.url = url
+        self.redundancy = max(1, redundancy)
+        self._connections = connections
+        self._routes = {}       # {asset_id: (handler, ...)}, replaced (never mutated) so dispatch reads it unlocked
+        self._asset_conns = {}  # {asset_id: [connection, ...]} (redundancy entries each)
+        self._idle_waiters = set()  # handlers waiting for buffered frames to drain
+        self._lock = threading.Lock()
+        self._recent = OrderedDict()  # {frame: [first arrival time, copies still expected]}
+        self._applied_ts = {}  # {asset_id: newest feed timestamp dispatched} (redundant mode)
+        self._local = threading.local()  # received_at of the frame being dispatched on this thread
+        # Held while a frame is deduplicated and dispatched. Handlers take it to read or change
+        # their books from any other thread (timers, REST snapshots), so they never see one mid-update
+        self.dispatch_lock = threading.RLock()
+
+    def subscribe(self, asset_ids: list, handler):
+        """Route asset_ids to handler too, subscribing new ones on the least-loaded connection(s).
+
+        Tokens another handler already follows stay on their connection(s) and
+        are re-requested there, so the venue sends this handler a book snapshot.
+        """
+        asset_ids = [a for a in asset_ids if a]
+        by_conn = {}
+        with self._lock:
+            least_loaded = sorted(self._connections, key=lambda c: len(c.assets))[:self.redundancy]
+            for asset_id in asset_ids:
+                handlers = self._routes.get(asset_id, ())
+                if handler not in handlers:
+                    self._routes[asset_id] = handlers + (handler,)
+                conns = self._asset_conns.setdefault(asset_id, least_loaded)
+                for conn in conns:
+                    conn.assets.add(asset_id)
+                    by_conn.setdefault(conn, []).append(asset_id)
+        live = False
+        for conn, ids in by_conn.items():
+            if conn.connected:
+                conn.send_operation(ids, "subscribe")
+                live = True
+            else:
+                conn.start()
+        if live:
+            handler.on_feed_open()
+
+    def unsubscribe(self, asset_ids: list, handler):
+        """Stop routing asset_ids to handler; tokens left without handlers are unsubscribed on their connection(s)."""
+        by_conn = {}
+        with self._lock:
+            for asset_id in asset_ids:
+                handlers = tuple(h for h in self._routes.get(asset_id, ()) if h is not handler)
+                if handlers:
+                    self._routes[asset_id] = handlers
+                    continue
+                self._routes.pop(asset_id, None)
+                self._applied_ts.pop(asset_id, None)
+                for conn in self._asset_conns.pop(asset_id, ()):
+                    conn.assets.discard(asset_id)
+                    by_conn.setdefault(conn, []).append(asset_id)
+        self._idle_waiters.discard(handler)
+        for conn, ids in by_conn.items():
+            conn.send_operation(ids, "unsubscribe")
+
+    def resubscribe(self, asset_ids: list):
+        """Re-request asset_ids on their connection(s), which makes the venue resend book snapshots."""
+        by_conn = {}
+        with self._lock:
+            for asset_id in asset_ids:
+                for conn in self._asset_conns.get(asset_id, ()):
+                    by_conn.setdefault(conn, []).append(asset_id)
+        for conn, ids in by_conn.items():
+            conn.send_operation(ids, "subscribe")
+
+    def reconnect(self, asset_ids: list):
+        """Drop and immediately reopen the connection(s) carrying asset_ids (stalled feed)."""
+        with self._lock:
+            conns = {conn for asset_id in asset_ids for conn in self._asset_conns.get(asset_id, ())}
+        for conn in conns:
+            conn.reconnect()
+
+    def silence(self, asset_ids: list, now: float) -> float:
+        """Seconds (monotonic now) since any live connection carrying asset_ids delivered a frame for any token."""
+        with self._lock:
+            conns = {conn for asset_id in asset_ids for conn in self._asset_conns.get(asset_id, ())}
+        last = [conn.last_frame for conn in conns if conn.connected and conn.last_frame is not None]
+        return now - max(last) if last else 0.0
+
+    def is_connected(self, asset_id: str) -> bool:
+        return any(conn.connected for conn in self._asset_conns.get(asset_id, ()))
+
+    def has_pending_data(self, asset_id: str) -> bool:
+        """True if more frames for asset_id are already waiting to be processed."""
+        return False
+
+    def defer_until_idle(self, handler):
+        """Call handler.on_feed_idle() once the currently buffered frames have been processed."""
+        self._idle_waiters.add(handler)
+
+    def frame_received_at(self) -> float | None:
+        """perf_counter time the frame now being dispatched came off its socket (for latency traces)."""
+        return getattr(self._local, "received_at", None)
+
+    def stats(self) -> dict:
+        """Per-connection arrival stats (redundant mode only), for status display."""
+        if self.redundancy == 1:
+            return {}
+        return {f"feed{conn.index}": conn.stats.summary() for conn in self._connections}
+
+    def stop(self):
+        for conn in self._connections:
+            conn.stop()
+
+    def _notify_idle(self):
+        waiters = self._idle_waiters
+        self._idle_waiters = set()
+        for handler in waiters:
+            handler.on_feed_idle()
+
+    def _first_arrival(self, conn, message) -> bool:
+        """False for a later copy of a frame already received on another connection (redundant mode).
+
+        Callers serialize frames, so the first copy is also dispatched before any later frame.
+        """
+        if self.redundancy == 1 or message == "PONG":
+            return True
+        now = time.perf_counter()
+        stats = conn.stats
+        stats.frames += 1
+        seen = self._recent.get(message)
+        if seen is None:
+            self._recent[message] = [now, self.redundancy - 1]
+            if len(self._recent) > DEDUP_WINDOW:
+                self._recent.popitem(last=False)
+            stats.first += 1
+            return True
+        seen[1] -= 1
+        if seen[1] <= 0:
+            del self._recent[message]
+        stats.lags.append(now - seen[0])
+        return False
+
+    def _drop_stale_snapshots(self, events: list) -> list:
+        """Drop book snapshots older than the newest event already dispatched for their token.
+
+        A snapshot sent on only one connection (after it reconnects) has no
+        copy to deduplicate against; if the other connection already delivered
+        newer deltas, loading it would roll the book back.
+        """
+        applied = self._applied_ts
+        kept = []
+        for event in events:
+            ts = event.timestamp
+            if ts is not None:
+                newest = applied.get(event.asset_id)
+                if newest is None or ts >= newest:
+                    applied[event.asset_id] = ts
+                elif type(event) is BookEvent:
+                    continue
+            kept.append(event)
+        return kept
+
+    def _handlers_for(self, asset_ids: list) -> list:
+        """Distinct handlers routed from asset_ids."""
+        handlers = []
+        for asset_id in asset_ids:
+            for handler in self._routes.get(asset_id, ()):
+                if handler not in handlers:
+                    handlers.append(handler)
+        return handlers
+
+    def _sole_assets(self, conn) -> list:
+        """conn's tokens that no other live connection also carries (caller holds _lock)."""
+        return [
+            asset_id for asset_id in conn.assets
+            if not any(c is not conn and c.connected for c in self._asset_conns.get(asset_id, ()))
+        ]
+
+    def _sole_live_handlers(self, conn) -> list:
+        """Handlers whose tokens are carried by no live connection other than conn."""
+        with self._lock:
+            assets = self._sole_assets(conn)
+        return self._handlers_for(assets)
+
+    def _mark_connected(self, conn, connected: bool) -> tuple[list, list]:
+        """Set conn's state. Returns (its token IDs, handlers to notify).
+
+        With redundancy a handler whose tokens are still live on another
+        connection isn't told about this one opening or closing. The flag flips
+        under the lock, so of two connections opening together exactly one notifies.
+        """
+        with self._lock:
+            conn.connected = connected
+            assets = list(conn.assets)
+            sole = self._sole_assets(conn)
+        return assets, self._handlers_for(sole)
+
+    def _dispatch(self, events: list, received_at: float | None = None):
+        """Route one frame's events to their handlers, one process_events call per handler."""
+        self._local.received_at = received_at
+        if self.redundancy > 1:
+            events = self._drop_stale_snapshots(events)
+        routes = self._routes
+        batches = {}
+        for event in events:
+            for handler in routes.get(event.asset_id, ()):
+                batch = batches.get(handler)
+                if batch is None:
+                    batches[handler] = [event]
+                else:
+                    batch.append(event)
+        for handler, batch in batches.items():
+            handler.process_events(batch)
+
+
+class MarketFeed(FeedRouter):
+    """Multiplexed market-channel feed over threaded websocket-client connections."""
+
+    def __init__(self, url: str, num_connections: int = 1, scheduler: Scheduler = None, redundancy: int = 1):
+        super().__init__(url, [], redundancy)
+        self._scheduler = scheduler
+        count = max(1, num_connections, self.redundancy)
+        self._connections = [_FeedConnection(self, i) for i in range(count)]
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """Timer owner for connection PINGs (the shared scheduler unless one was given)."""
+        if self._scheduler is None:
+            self._scheduler = get_scheduler()
+        return self._scheduler
+
+    def has_pending_data(self, asset_id: str) -> bool:
+        """True if a connection carrying asset_id already has more frames buffered."""
+        return any(
+            conn.ws is not None and socket_has_pending_data(conn.ws)
+            for conn in self._asset_conns.get(asset_id, ())
+        )
@@ -0,0 +1,148 @@
+"""
+Feed health supervision for market monitors
+
+A connection can stall silently: the socket stays open and answers PINGs,
+but market frames stop. ArrivalStats learns each market's normal gap
+between frames separately for each phase of the interval (the last seconds
+before resolution are far busier than the first minutes), and stalled()
+flags a silence that is anomalous for the current phase.
+
+A stall only forces a reconnect (FeedRouter.reconnect) when the connection
+carrying the market has gone silent for every token on it
+(FeedRouter.silence); one quiet market on a busy connection just has its
+book re-requested. While a reconnected connection comes back the monitor
+loads a REST book snapshot (fetch_books), so trading is ready again as soon
+as the connection is up instead of after the WebSocket snapshot arrives. RecoveryMetrics records stalls and that
+time-to-ready for the status footer.
+
+Used by sniper.py and engine.py.
+"""
+
+import threading
+from bisect import bisect_right
+from collections import deque
+
+import requests
+
+from decoder import decode_books
+
+PHASE_EDGES = (10, 30, 60, 180)  # Seconds remaining that split an interval into phases
+EWMA_ALPHA = 0.05      # Weight of the newest gap once a phase has enough history
+MIN_SAMPLES = 20       # Gaps a phase needs before its own statistics are trusted
+STALL_SIGMAS = 6       # Silence beyond mean + STALL_SIGMAS * stddev is a stall
+STALL_MIN_GAP = 3.0    # Never declare a stall on less silence than this (seconds)
+STALL_MAX_GAP = 30.0   # Always declare one after this much silence (seconds)
+STALL_COOLDOWN = 15.0  # Seconds between stall recoveries (reconnect or resync) for one market
+CHECK_INTERVAL = 0.5   # Seconds between supervisor checks
+REST_TIMEOUT = 2.0     # Read timeout for REST book snapshots (seconds)
+READY_SAMPLES = 100    # Time-to-ready samples kept for percentiles
+
+
+def _phase(seconds_remaining: float) -> int:
+    return bisect_right(PHASE_EDGES, seconds_remaining)
+
+
+def _update(stats: list, gap: float):
+    """Fold one gap into [samples, mean, variance] (plain average until MIN_SAMPLES, then EWMA)."""
+    n, mean, var = stats
+    if n == 0:
+        stats[:] = [1, gap, 0.0]
+        return
+    alpha = max(EWMA_ALPHA, 1.0 / (n + 1))
+    diff = gap - mean
+    incr = alpha * diff
+    stats[:] = [n + 1, mean + incr, (1 - alpha) * (var + diff * incr)]
+
+
+class ArrivalStats:
+    """Inter-arrival statistics of one market's frames, per interval phase."""
+
+    def __init__(self):
+        self._phases = [[0, 0.0, 0.0] for _ in range(len(PHASE_EDGES) + 1)]  # [samples, mean, variance]
+        self._pooled = [0, 0.0, 0.0]  # All phases, used until a phase has its own history
+        self._last = None  # monotonic time of the last frame (or of the last reset)
+        self._skip = False  # Next gap spans a reset (reconnect, handover) and isn't learned
+
+    def reset(self, now: float):
+        """Restart the silence clock at now without learning the gap across it."""
+        self._last = now
+        self._skip = True
+
+    def record(self, now: float, seconds_remaining: float):
+        """A frame for this market arrived at monotonic time now."""
+        last = self._last
+        self._last = now
+        if last is None or self._skip:
+            self._skip = False
+            return
+        gap = now - last
+        _update(self._phases[_phase(seconds_remaining)], gap)
+        _update(self._pooled, gap)
+
+    def threshold(self, seconds_remaining: float) -> float:
+        """Longest normal silence in the current phase (seconds)."""
+        stats = self._phases[_phase(seconds_remaining)]
+        if stats[0] < MIN_SAMPLES:
+            stats = self._pooled
+        if stats[0] < MIN_SAMPLES:
+            return STALL_MAX_GAP
+        _, mean, var = stats
+        return min(STALL_MAX_GAP, max(STALL_MIN_GAP, mean + STALL_SIGMAS * var ** 0.5))
+
+    def silence(self, now: float) -> float:
+        """Seconds since the last frame (0 before the first)."""
+        return 0.0 if self._last is None else now - self._last
+
+    def stalled(self, now: float, seconds_remaining: float) -> bool:
+        return self.silence(now) > self.threshold(seconds_remaining)
+
+
+_arrivals = {}  # {market label: ArrivalStats}, kept across intervals so each phase has history
+
+
+def arrival_stats(market: str) -> ArrivalStats:
+    """Shared ArrivalStats for a market label (e.g. "BITCOIN-15M")."""
+    return _arrivals.setdefault(market, ArrivalStats())
+
+
+class RecoveryMetrics:
+    """Stall count and time from losing the feed to being ready to trade again."""
+
+    def __init__(self):
+        self.stalls = 0
+        self._ready = deque(maxlen=READY_SAMPLES)  # Seconds to ready, per recovery
+        self._lock = threading.Lock()
+
+    def record_stall(self):
+        with self._lock:
+            self.stalls += 1
+
+    def record_ready(self, seconds: float):
+        with self._lock:
+            self._ready.append(seconds)
+
+    def stats(self) -> dict:
+        """Footer fields, empty until something has been recovered."""
+        with self._lock:
+            samples = sorted(self._ready)
+            last = self._ready[-1] if self._ready else None
+            stalls = self.stalls
+        if not samples and not stalls:
+            return {}
+        stats = {"stalls": stalls}
+        if samples:
+            p50 = samples[len(samples) // 2] * 1000
+            stats["ready after reconnect"] = f"last {last * 1000:.0f}ms p50 {p50:.0f}ms"
+        return stats
+
+
+recovery = RecoveryMetrics()  # Shared by every monitor in the process
+
+_session = requests.Session()  # Keep-alive to the CLOB for snapshot fetches
+
+
+def fetch_books(host: str, token_ids: list, timeout: float = REST_TIMEOUT) -> list:
+    """Current book snapshots for token_ids as BookEvents, in one POST /books round trip."""
+    resp = _session.post(f"{host}/books", json=[{"token_id": t} for t in token_ids], timeout=(timeout, timeout))
+    resp.raise_for_status()
+    return decode_books(resp.json())
@@ -0,0 +1,145 @@
+"""
+Gamma market-discovery client
+
+One pooled keep-alive requests.Session is shared by every monitor, so an
+interval boundary doesn't pay a TCP + TLS handshake per lookup. A slug
+lookup queries /events and /markets concurrently (hedged) and returns the
+first valid answer. Attempts use short timeouts that grow on retry
+(ATTEMPT_TIMEOUTS), and retries draw on a shared RetryBudget so a Gamma
+outage can't multiply our request rate.
+
+Shared by sniper.py, recorder.py, fade_extreme.py and engine.py (which
+runs lookups in a worker thread).
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GAMMA_HOST = "https://gamma-api.polymarket.com"
+CONNECT_TIMEOUT = 1.5             # Seconds to establish a connection (pooled ones skip this)
+ATTEMPT_TIMEOUTS = (2.0, 4.0, 8.0)  # Read timeout per attempt; attempts after the first are retries
+POOL_SIZE = 16                    # Keep-alive connections (and lookup workers)
+ENDPOINTS = ("events", "markets")
+
+
+def event_from_events(data) -> dict | None:
+    """Parse an /events response: the first event, or None."""
+    if data and isinstance(data, list):
+        return data[0]
+    return None
+
+
+def event_from_markets(data, slug: str) -> dict | None:
+    """Parse a /markets response into the event shape callers expect, or None."""
+    if data and isinstance(data, list):
+        market = data[0]
+        return {"title": market.get("question", ""), "markets": [market], "slug": slug}
+    return None
+
+
+PARSERS = {
+    "events": lambda data, slug: event_from_events(data),
+    "markets": event_from_markets,
+}
+
+
+class RetryBudget:
+    """Token bucket allowing retries for up to `ratio` of requests, plus a small reserve.
+
+    Every original request deposits `ratio` tokens (capped at `cap`); every
+    retry withdraws one. When Gamma is down, retries stop at the budget
+    instead of tripling the request rate.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 3.0, cap: float = 10.0):
+        self.ratio = ratio
+        self.cap = cap
+        self._tokens = reserve
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self._tokens = min(self.cap, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+retry_budget = RetryBudget()  # Shared by every lookup in the process
+
+
+class GammaClient:
+    """Hedged, pooled slug lookups against the Gamma API."""
+
+    def __init__(self, host: str = GAMMA_HOST, pool_size: int = POOL_SIZE):
+        self.host = host
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.budget = retry_budget
+        self._pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="gamma")
+
+    def fetch_event(self, slug: str) -> dict | None:
+        """Event data for slug, or None if neither endpoint knows it yet.
+
+        Raises the last error if every attempt failed (timeouts, HTTP errors).
+        """
+        self.budget.record_request()
+        error = None
+        for attempt, timeout in enumerate(ATTEMPT_TIMEOUTS):
+            if attempt and not self.budget.try_spend():
+                break
+            result, error = self._hedged(slug, timeout)
+            if result is not None or error is None:
+                return result  # A valid answer, or both endpoints answered "not found"
+        raise error
+
+    def _get(self, endpoint: str, slug: str, timeout: float) -> dict | None:
+        resp = self.session.get(
+            f"{self.host}/{endpoint}",
+            params={"slug": slug, "limit": 1},
+            timeout=(CONNECT_TIMEOUT, timeout),
+        )
+        resp.raise_for_status()
+        return PARSERS[endpoint](resp.json(), slug)
+
+    def _hedged(self, slug: str, timeout: float) -> tuple[dict | None, Exception | None]:
+        """Query both endpoints at once; the first valid answer wins (the other is left to finish)."""
+        pending = {self._pool.submit(self._get, endpoint, slug, timeout) for endpoint in ENDPOINTS}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if result is not None:
+                    return result, None
+        return None, error
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> GammaClient:
+    """Process-wide Gamma client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GammaClient()
+        return _client
+
+
+def fetch_event(slug: str) -> dict | None:
+    """Hedged lookup of slug on the shared client (see GammaClient.fetch_event)."""
+    return get_client().fetch_event(slug)
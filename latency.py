@@ -0,0 +1,149 @@
+"""
+Order latency instrumentation: receive -> decide -> sign -> post -> ack
+
+Each order attempt carries an OrderTrace of perf_counter marks:
+    received    frame read off the socket (feed)
+    applied     frame applied to the book (monitor)
+    detected    opportunity found (monitor)
+    dispatched  execute_snipe started (after the executor queue)
+    signed      signed order in hand (pre-signed or signed inline)
+    sent        post_order called (after waiting for the market's submission lock)
+    acked       post_order returned (or raised)
+Marks that don't apply (e.g. a timer-driven evaluation has no frame) are
+skipped, and the segment spans the gap.
+
+Completed attempts go into log-bucket histograms per (market, phase), where
+phase is the seconds remaining at detection (same edges as feed_health), and
+per segment. stats() feeds the status footer and summary() is printed at
+shutdown. Used by sniper.py and engine.py.
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from feed_health import PHASE_EDGES
+
+STAGES = ("received", "applied", "detected", "dispatched", "signed", "sent", "acked")
+BUCKETS_MS = tuple(0.01 * 2 ** i for i in range(24))  # Upper edges: 10us .. ~84s
+
+
+def phase_label(seconds_remaining) -> str:
+    """Interval phase bucket for seconds remaining, e.g. "<10s", "10-30s", ">=180s"."""
+    if seconds_remaining is None:
+        return "n/a"
+    i = bisect_right(PHASE_EDGES, seconds_remaining)
+    if i == 0:
+        return f"<{PHASE_EDGES[0]}s"
+    if i == len(PHASE_EDGES):
+        return f">={PHASE_EDGES[-1]}s"
+    return f"{PHASE_EDGES[i - 1]}-{PHASE_EDGES[i]}s"
+
+
+class OrderTrace:
+    """perf_counter marks for one order attempt."""
+
+    __slots__ = ("marks",)
+
+    def __init__(self, **marks):
+        self.marks = {stage: t for stage, t in marks.items() if t is not None}
+
+    def mark(self, stage: str):
+        self.marks[stage] = time.perf_counter()
+
+    def __contains__(self, stage: str) -> bool:
+        return stage in self.marks
+
+    def segments(self) -> list[tuple[str, float]]:
+        """(name, ms) between consecutive recorded stages, e.g. ("sent→acked", 84.2)."""
+        present = [stage for stage in STAGES if stage in self.marks]
+        return [
+            (f"{a}→{b}", (self.marks[b] - self.marks[a]) * 1000)
+            for a, b in zip(present, present[1:])
+        ]
+
+    def total_ms(self) -> float:
+        present = [self.marks[stage] for stage in STAGES if stage in self.marks]
+        return (present[-1] - present[0]) * 1000 if len(present) > 1 else 0.0
+
+    def format(self) -> str:
+        """Trade-log form: "received→applied 0.04ms | ... | total 86.7ms"."""
+        parts = [f"{name} {ms:.2f}ms" for name, ms in self.segments()]
+        parts.append(f"total {self.total_ms():.2f}ms")
+        return " | ".join(parts)
+
+
+class Histogram:
+    """Counts in BUCKETS_MS log buckets; percentiles report the bucket's upper edge."""
+
+    __slots__ = ("counts", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+
+    def add(self, ms: float):
+        self.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else float("inf")
+        return 0.0
+
+
+class LatencyHistograms:
+    """Per (market, phase) histograms of total latency and of each segment."""
+
+    def __init__(self):
+        self._hists = {}  # {(market, phase): {segment or "total": Histogram}}
+        self._all = Histogram()  # Totals across every market and phase
+        self._lock = threading.Lock()
+
+    def record(self, market: str, seconds_remaining, trace: OrderTrace):
+        key = (market, phase_label(seconds_remaining))
+        total = trace.total_ms()
+        with self._lock:
+            hists = self._hists.setdefault(key, {})
+            for name, ms in trace.segments() + [("total", total)]:
+                hists.setdefault(name, Histogram()).add(ms)
+            self._all.add(total)
+
+    def stats(self) -> dict:
+        """Footer fields, empty until an order has been sent."""
+        with self._lock:
+            if not self._all.count:
+                return {}
+            return {"order latency": f"p50 {self._all.percentile(0.5):.0f}ms p99 {self._all.percentile(0.99):.0f}ms"}
+
+    def snapshot(self) -> dict:
+        """{market: {phase: {segment: {"count", "p50_ms", "p99_ms"}}}} for any metrics consumer."""
+        out = {}
+        with self._lock:
+            for (market, phase), hists in self._hists.items():
+                out.setdefault(market, {})[phase] = {
+                    name: {"count": h.count, "p50_ms": h.percentile(0.5), "p99_ms": h.percentile(0.99)}
+                    for name, h in hists.items()
+                }
+        return out
+
+    def summary(self) -> str:
+        """Multi-line shutdown report (empty string if nothing was recorded)."""
+        snapshot = self.snapshot()
+        if not snapshot:
+            return ""
+        lines = ["ORDER LATENCY (p50 / p99 ms, bucketed)"]
+        for market in sorted(snapshot):
+            for phase, segments in sorted(snapshot[market].items()):
+                total = segments.pop("total")
+                lines.append(f"  {market} [{phase}] n={total['count']}  total {total['p50_ms']:.2f} / {total['p99_ms']:.2f}")
+                for name, h in segments.items():
+                    lines.append(f"      {name:<22} {h['p50_ms']:8.2f} / {h['p99_ms']:.2f}")
+        return "\n".join(lines)
+
+
+histograms = LatencyHistograms()  # Shared by every monitor in the process
@@ -0,0 +1,193 @@
+"""
+Slug-keyed market metadata cache for Polymarket up/down markets
+
+Gamma event data (outcomes, clobTokenIds, closed flag, outcomePrices) is
+cached by slug so retries, standby lookups, resolution checks and separate
+scripts don't refetch it:
+- Settled events (every market closed with a final price) never change and
+  are kept for SETTLED_TTL.
+- Open events are kept for OPEN_TTL but never past their interval's end,
+  so a lookup after the boundary sees the closed/resolved state.
+- Not-found lookups aren't cached (the market may be listed any moment).
+
+prefetch() resolves the current and next interval for each configured
+(asset, interval) ahead of time; the cache is persisted to CACHE_FILE so
+restarts and backtests start warm. stats() reports hit/miss counters.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import clock
+import gamma
+
+CACHE_FILE = Path("logs") / "market_cache.json"
+OPEN_TTL = 300               # Seconds an open event is trusted (capped at its interval end)
+SETTLED_TTL = 7 * 24 * 3600  # Seconds a settled event is kept
+PREFETCH_INTERVAL = 30       # Seconds between prefetch passes
+
+
+def _slug_interval_end(slug: str) -> int | None:
+    """Interval end from an up/down slug ("btc-updown-15m-1770000000"), or None for other slugs."""
+    parts = slug.split("-")
+    try:
+        return int(parts[-1]) + int(parts[-2].rstrip("m")) * 60
+    except (IndexError, ValueError):
+        return None
+
+
+def _is_settled(event: dict) -> bool:
+    """Every market closed with a final (~$1) outcome price."""
+    markets = event.get("markets") or []
+    if not markets:
+        return False
+    for market in markets:
+        if not market.get("closed", False):
+            return False
+        prices = market.get("outcomePrices")
+        try:
+            prices = json.loads(prices) if isinstance(prices, str) else prices or []
+            if not any(float(p) > 0.9 for p in prices if p):
+                return False
+        except (TypeError, ValueError):
+            return False
+    return True
+
+
+class MarketCache:
+    """In-memory slug -> event cache with TTLs and a JSON file behind it."""
+
+    def __init__(self, path: Path = CACHE_FILE):
+        self.path = path
+        self._entries = {}  # {slug: (expires_unix, event)}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+
+    def get(self, slug: str) -> dict | None:
+        """Cached event for slug if still fresh (counts a hit or miss)."""
+        self._load()
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry and entry[0] > clock.now():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, slug: str, event: dict | None):
+        """Cache a fetched event with the TTL its state allows."""
+        if not event:
+            return
+        now = clock.now()
+        if _is_settled(event):
+            expires = now + SETTLED_TTL
+        else:
+            expires = now + OPEN_TTL
+            interval_end = _slug_interval_end(slug)
+            if interval_end is not None:
+                expires = min(expires, interval_end)
+        if expires <= now:
+            return
+        with self._lock:
+            self._entries[slug] = (expires, event)
+        self._save()
+
+    def get_event(self, slug: str) -> dict | None:
+        """Read-through lookup: cached event, else fetch from Gamma and cache it.
+
+        Raises like gamma.fetch_event when the fetch fails.
+        """
+        event = self.get(slug)
+        if event is None:
+            event = gamma.fetch_event(slug)
+            self.put(slug, event)
+        return event
+
+    def upcoming_slugs(self, markets: list) -> list[str]:
+        """Slugs of the current and next interval for each (asset, interval_minutes)."""
+        slugs = []
+        for asset, interval_minutes in markets:
+            start = clock.interval_start(interval_minutes)
+            slugs.append(clock.market_slug(asset, interval_minutes, start))
+            slugs.append(clock.market_slug(asset, interval_minutes, start + interval_minutes * 60))
+        return slugs
+
+    def prefetch(self, markets: list):
+        """Fetch any uncached current/next-interval slugs for markets (blocking; run off the hot path)."""
+        for slug in self.upcoming_slugs(markets):
+            if self.cached(slug):
+                continue
+            try:
+                event = gamma.fetch_event(slug)
+            except Exception:
+                continue
+            if event:
+                self.prefetched += 1
+                self.put(slug, event)
+
+    def cached(self, slug: str) -> bool:
+        """True if slug has a fresh entry (doesn't count as a hit or miss)."""
+        self._load()
+        with self._lock:
+            entry = self._entries.get(slug)
+            return bool(entry) and entry[0] > clock.now()
+
+    def stats(self) -> dict:
+        return {"cache hits": self.hits, "cache misses": self.misses, "prefetched": self.prefetched}
+
+    def _read_disk(self) -> dict:
+        """Fresh entries from the cache file ({} if missing or unreadable)."""
+        now = clock.now()
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+            return {slug: (expires, event) for slug, (expires, event) in stored.items() if expires > now}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}  # Missing, truncated or not in our format: start cold
+
+    def _load(self):
+        if self._loaded:
+            return
+        stored = self._read_disk()
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                for slug, entry in stored.items():
+                    self._entries.setdefault(slug, entry)
+
+    def _save(self):
+        """Merge with the file (other scripts share it) and write atomically (temp file + rename)."""
+        stored = self._read_disk()
+        now = clock.now()
+        with self._lock:
+            for slug, entry in stored.items():
+                current = self._entries.get(slug)
+                if current is None or entry[0] > current[0]:
+                    self._entries[slug] = entry
+            self._entries = {slug: entry for slug, entry in self._entries.items() if entry[0] > now}
+            data = json.dumps(self._entries)
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # Persistence is best-effort; the in-memory cache still works
+
+
+_cache = MarketCache()
+
+
+def get_cache() -> MarketCache:
+    return _cache
+
+
+def get_event(slug: str) -> dict | None:
+    """Read-through lookup on the shared cache (see MarketCache.get_event)."""
+    return _cache.get_event(slug)
@@ -0,0 +1,268 @@
+"""
+Shared Order Book for Polymarket monitors
+
+Keeps each side of a token's book as parallel price/size arrays sorted by
+price, so a level update is a bisect + insert/delete instead of rebuilding
+and re-sorting a list of dicts. Used by sniper.py, recorder.py and
+fade_extreme.py.
+
+Prices and sizes are parsed once at ingest into integers: prices in ticks
+of 1/PRICE_SCALE (0.98 -> 980) and sizes in units of 1/SIZE_SCALE shares.
+Everything downstream compares ints; convert back only for display.
+
+Updates report whether they moved the top of book (best price or its
+size), so callers can skip strategy evaluation on deep-level churn.
+
+Each side also keeps Fenwick trees (prefix sums) of size and notional
+indexed by tick, so cumulative depth / VWAP to a price limit is
+O(log PRICE_SCALE) and maintained on every update.
+
+matches_top() checks the local top of book against the best_bid/best_ask
+the feed attaches to each price change, so divergence is detected from
+the feed itself instead of by periodic blind resyncs.
+"""
+
+from bisect import bisect_left
+
+PRICE_SCALE = 1000        # ticks per $1.00
+SIZE_SCALE = 1_000_000    # size units per share (CTF base units)
+
+
+def price_to_ticks(price) -> int:
+    """Convert a feed price ("0.98" or 0.98) to integer ticks."""
+    return int(round(float(price) * PRICE_SCALE))
+
+
+def ticks_to_price(ticks: int) -> float:
+    """Convert integer ticks back to a float price for display/orders."""
+    return ticks / PRICE_SCALE
+
+
+def size_to_units(size) -> int:
+    """Convert a feed size ("123.45" or 123.45) to integer size units."""
+    return int(round(float(size) * SIZE_SCALE))
+
+
+def units_to_size(units: int) -> float:
+    """Convert integer size units back to a float share count."""
+    return units / SIZE_SCALE
+
+
+class _PrefixSums:
+    """Fenwick tree over ticks 1..PRICE_SCALE."""
+
+    __slots__ = ("tree",)
+
+    def __init__(self):
+        self.tree = [0] * (PRICE_SCALE + 1)
+
+    def add(self, tick: int, delta: int):
+        """Add delta at tick. Ticks outside 1..PRICE_SCALE are ignored, as in rebuild()."""
+        tree = self.tree
+        n = len(tree)
+        if tick <= 0:
+            return  # tick & -tick is 0 here: the loop below would never advance
+        while tick < n:
+            tree[tick] += delta
+            tick += tick & -tick
+
+    def sum_to(self, tick: int) -> int:
+        """Sum of ticks 1..tick (inclusive)."""
+        tree = self.tree
+        tick = min(tick, len(tree) - 1)
+        total = 0
+        while tick > 0:
+            total += tree[tick]
+            tick -= tick & -tick
+        return total
+
+    def rebuild(self, ticks: list, values: list):
+        """O(n) rebuild from parallel tick/value arrays."""
+        tree = [0] * (PRICE_SCALE + 1)
+        n = len(tree)
+        for tick, value in zip(ticks, values):
+            if 0 < tick < n:
+                tree[tick] += value
+        for i in range(1, n):
+            parent = i + (i & -i)
+            if parent < n:
+                tree[parent] += tree[i]
+        self.tree = tree
+
+
+class BookSide:
+    """One side of an order book: ascending parallel tick/size-unit arrays."""
+
+    __slots__ = ("prices", "sizes", "is_bid", "_size_sums", "_notional_sums")
+
+    def __init__(self, is_bid: bool):
+        self.prices: list[int] = []
+        self.sizes: list[int] = []
+        self.is_bid = is_bid
+        self._size_sums = _PrefixSums()
+        self._notional_sums = _PrefixSums()
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def clear(self):
+        self.prices.clear()
+        self.sizes.clear()
+        self._size_sums = _PrefixSums()
+        self._notional_sums = _PrefixSums()
+
+    def load(self, levels: list):
+        """Replace all levels from a snapshot list of (price, size) pairs (raw feed strings)."""
+        merged = {}
+        for price, size in levels:
+            size = size_to_units(size)
+            if size > 0:
+                merged[price_to_ticks(price)] = size
+        self.prices = sorted(merged)
+        self.sizes = [merged[p] for p in self.prices]
+        self._size_sums.rebuild(self.prices, self.sizes)
+        self._notional_sums.rebuild(self.prices, [p * q for p, q in zip(self.prices, self.sizes)])
+
+    def update(self, price: int, size: int) -> bool:
+        """Set the size at a price level. Size <= 0 removes the level.
+
+        Returns True if the top level (price or size) changed.
+        """
+        prices = self.prices
+        n = len(prices)
+        i = bisect_left(prices, price)
+        exists = i < n and prices[i] == price
+        if self.is_bid:
+            at_top = i == n - 1 if exists else i == n
+        else:
+            at_top = i == 0
+        old = self.sizes[i] if exists else 0
+        if size > 0:
+            if exists:
+                if old == size:
+                    return False
+                self.sizes[i] = size
+            else:
+                prices.insert(i, price)
+                self.sizes.insert(i, size)
+        elif exists:
+            del prices[i]
+            del self.sizes[i]
+            size = 0
+        else:
+            return False
+        delta = size - old
+        self._size_sums.add(price, delta)
+        self._notional_sums.add(price, delta * price)
+        return at_top
+
+    def best(self) -> tuple[int, int] | None:
+        """(price, size) at the top of this side, or None if empty."""
+        if not self.prices:
+            return None
+        i = -1 if self.is_bid else 0
+        return self.prices[i], self.sizes[i]
+
+    def _range_sums(self, limit: int) -> tuple[int, int]:
+        """(size, notional) of levels at or better than limit."""
+        if self.is_bid:
+            size = self._size_sums.sum_to(PRICE_SCALE) - self._size_sums.sum_to(limit - 1)
+            notional = self._notional_sums.sum_to(PRICE_SCALE) - self._notional_sums.sum_to(limit - 1)
+        else:
+            size = self._size_sums.sum_to(limit)
+            notional = self._notional_sums.sum_to(limit)
+        return size, notional
+
+    def depth(self, limit: int) -> int:
+        """Cumulative size units at or better than limit (asks <= limit, bids >= limit)."""
+        return self._range_sums(limit)[0]
+
+    def vwap(self, limit: int) -> float:
+        """Volume-weighted price in ticks of levels at or better than limit, 0.0 if none."""
+        size, notional = self._range_sums(limit)
+        return notional / size if size else 0.0
+
+    def levels(self) -> list[tuple[int, int]]:
+        """All levels best-first."""
+        pairs = list(zip(self.prices, self.sizes))
+        return pairs[::-1] if self.is_bid else pairs
+
+
+class OrderBook:
+    """Order book for a single token (bids + asks)."""
+
+    __slots__ = ("bids", "asks")
+
+    def __init__(self):
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+
+    def side(self, side: str) -> BookSide:
+        """Resolve "bids"/"asks" (or feed-style "BUY"/"SELL") to a BookSide."""
+        return self.bids if side in ("bids", "BUY") else self.asks
+
+    def top(self) -> tuple:
+        """(best_bid, best_ask) as (price, size) tuples or None."""
+        return self.bids.best(), self.asks.best()
+
+    def load_snapshot(self, bids: list, asks: list) -> bool:
+        """Replace the whole book from (price, size) level lists. Returns True if the top changed."""
+        before = self.top()
+        self.bids.load(bids)
+        self.asks.load(asks)
+        return self.top() != before
+
+    def update_level(self, side: str, price, size) -> bool:
+        """Apply a single price-level change. Accepts raw feed strings.
+
+        Returns True if the update moved the top of book.
+        """
+        return self.side(side).update(price_to_ticks(price), size_to_units(size))
+
+    def best_bid(self) -> tuple[int, int] | None:
+        return self.bids.best()
+
+    def best_ask(self) -> tuple[int, int] | None:
+        return self.asks.best()
+
+    def ask_depth(self, max_price: int) -> int:
+        """Total ask size units available at or below max_price (ticks)."""
+        return self.asks.depth(max_price)
+
+    def ask_vwap(self, max_price: int) -> float:
+        """VWAP in ticks of sweeping all asks at or below max_price."""
+        return self.asks.vwap(max_price)
+
+    def bid_depth(self, min_price: int) -> int:
+        """Total bid size units available at or above min_price (ticks)."""
+        return self.bids.depth(min_price)
+
+    def bid_vwap(self, min_price: int) -> float:
+        """VWAP in ticks of hitting all bids at or above min_price."""
+        return self.bids.vwap(min_price)
+
+    def matches_top(self, best_bid, best_ask) -> bool:
+        """Compare the local top against feed-reported best_bid/best_ask strings.
+
+        An empty side matches the feed's sentinels (bid "0", ask "1"). Fields
+        that are missing (None) are not checked.
+        """
+        if best_bid is not None and price_to_ticks(best_bid) != self.best_bid_price():
+            return False
+        if best_ask is not None:
+            local_ask = self.asks.prices[0] if self.asks.prices else PRICE_SCALE
+            if price_to_ticks(best_ask) != local_ask:
+                return False
+        return True
+
+    def best_bid_price(self) -> int:
+        """Best bid in ticks, 0 if no bids."""
+        return self.bids.prices[-1] if self.bids.prices else 0
+
+    def best_ask_price(self) -> int:
+        """Best ask in ticks, 0 if no asks."""
+        return self.asks.prices[0] if self.asks.prices else 0
+
+    def best_ask_size(self) -> int:
+        """Size units at best ask, 0 if no asks."""
+        return self.asks.sizes[0] if self.asks.sizes else 0
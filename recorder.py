@@ -14,62 +14,32 @@ import json
 import time
 import argparse
 import threading
-import requests
 from pathlib import Path
-from datetime import datetime, timedelta, timezone
-from zoneinfo import ZoneInfo
+from datetime import datetime, timezone
 from websocket import WebSocketApp
 
+import clock
+import market_cache
+from decoder import PriceChange, decode
+from orderbook import OrderBook, ticks_to_price, units_to_size
+from scheduler import get_scheduler
+
 # API Configuration
-GAMMA_HOST = "https://gamma-api.polymarket.com"
 WS_URL = "wss://ws-subscriptions-clob.polymarket.com"
 
 # Output directory
 LOG_DIR = Path("logs")
 
 
-def get_current_et_time():
-    """Get current time in Eastern Time."""
-    try:
-        return datetime.now(ZoneInfo("America/New_York"))
-    except Exception:
-        from datetime import timezone
-        utc_now = datetime.now(timezone.utc)
-        return utc_now + timedelta(hours=-5)
-
-
-def get_interval_timestamp(interval_minutes: int) -> int:
-    """Get Unix timestamp for the current interval."""
-    et_now = get_current_et_time()
-    minute = (et_now.minute // interval_minutes) * interval_minutes
-    interval_time = et_now.replace(minute=minute, second=0, microsecond=0)
-    return int(interval_time.timestamp())
-
-
 def generate_market_slug(asset: str, interval_minutes: int) -> str:
     """Generate market slug for current interval."""
-    base_short = {"bitcoin": "btc", "ethereum": "eth", "solana": "sol", "xrp": "xrp"}.get(asset, asset)
-    timestamp = get_interval_timestamp(interval_minutes)
-    return f"{base_short}-updown-{interval_minutes}m-{timestamp}"
+    return clock.market_slug(asset, interval_minutes)
 
 
 def fetch_market_by_slug(slug: str) -> dict | None:
     """Fetch market data by slug."""
     try:
-        resp = requests.get(f"{GAMMA_HOST}/events", params={"slug": slug, "limit": 1}, timeout=10)
-        if resp.status_code == 200:
-            data = resp.json()
-            if data and len(data) > 0:
-                return data[0]
-
-        resp = requests.get(f"{GAMMA_HOST}/markets", params={"slug": slug, "limit": 1}, timeout=10)
-        if resp.status_code == 200:
-            data = resp.json()
-            if data and len(data) > 0:
-                market = data[0]
-                return {"title": market.get("question", ""), "markets": [market], "slug": slug}
-
-        return None
+        return market_cache.get_event(slug)
     except Exception as e:
         print(f"  Error fetching market: {e}")
         return None
@@ -88,7 +58,7 @@ class OrderBookRecorder:
         self.up_token = None
         self.down_token = None
         self.interval_end_unix = 0
-        self.orderbooks = {}  # {token_id: {bids: [...], asks: [...]}}
+        self.orderbooks: dict[str, OrderBook] = {}
 
         # Recording state
         self.csv_writer = None
@@ -96,10 +66,14 @@ class OrderBookRecorder:
         self.event_count = 0
         self.ws = None
         self.running = False
+        self._timers = []  # Ping/status timers for the current connection
 
     def setup_market(self, slug: str) -> bool:
         """Fetch market and extract UP/DOWN tokens."""
-        event_data = fetch_market_by_slug(slug)
+        return self.setup_from_event(fetch_market_by_slug(slug))
+
+    def setup_from_event(self, event_data: dict | None) -> bool:
+        """Extract UP/DOWN tokens from a Gamma event."""
         if not event_data:
             return False
 
@@ -148,19 +122,13 @@ class OrderBookRecorder:
 
     def get_best_ask(self, token_id: str) -> float:
         """Get best (lowest) ask price for a token."""
-        book = self.orderbooks.get(token_id, {})
-        asks = book.get("asks", [])
-        if asks:
-            return float(asks[0]["price"])
-        return 0.0
+        book = self.orderbooks.get(token_id)
+        return ticks_to_price(book.best_ask_price()) if book else 0.0
 
     def get_best_size(self, token_id: str) -> float:
         """Get size at best ask for a token."""
-        book = self.orderbooks.get(token_id, {})
-        asks = book.get("asks", [])
-        if asks:
-            return float(asks[0]["size"])
-        return 0.0
+        book = self.orderbooks.get(token_id)
+        return units_to_size(book.best_ask_size()) if book else 0.0
 
     def write_row(self, event_type: str, token_id: str, book_side: str, price: str, size: str):
         """Write a single row to CSV."""
@@ -171,7 +139,7 @@ class OrderBookRecorder:
         best_up = self.get_best_ask(self.up_token)
         best_down = self.get_best_ask(self.down_token)
         price_sum = best_up + best_down if best_up > 0 and best_down > 0 else 0.0
-        secs_remaining = max(0, self.interval_end_unix - int(time.time()))
+        secs_remaining = clock.seconds_until(self.interval_end_unix)
 
         self.csv_writer.writerow([
             datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
@@ -189,86 +157,79 @@ class OrderBookRecorder:
 
     def update_book_level(self, asset_id: str, side: str, price: str, size: str):
         """Update a single price level in the order book."""
-        book = self.orderbooks.get(asset_id, {"bids": [], "asks": []})
-        levels = book.get(side, [])
-        levels = [l for l in levels if l.get("price") != price]
-        if float(size) > 0:
-            levels.append({"price": price, "size": size})
-        if side == "bids":
-            levels.sort(key=lambda x: float(x["price"]), reverse=True)
-        else:
-            levels.sort(key=lambda x: float(x["price"]))
-        book[side] = levels
-        self.orderbooks[asset_id] = book
+        book = self.orderbooks.get(asset_id)
+        if book is None:
+            book = self.orderbooks[asset_id] = OrderBook()
+        book.update_level(side, price, size)
 
     def on_message(self, ws, message):
         """Handle WebSocket messages."""
-        if message == "PONG":
-            return
-        try:
-            data = json.loads(message)
-        except json.JSONDecodeError:
-            return
-
-        # Initial book snapshot (list format)
-        if isinstance(data, list):
-            for event in data:
-                if event.get("event_type") == "book" and event.get("asset_id"):
-                    asset_id = event["asset_id"]
-                    self.orderbooks[asset_id] = {
-                        "bids": event.get("bids", []),
-                        "asks": event.get("asks", []),
-                    }
-                    for bid in event.get("bids", []):
-                        self.write_row("snapshot", asset_id, "bid", bid["price"], bid["size"])
-                    for ask in event.get("asks", []):
-                        self.write_row("snapshot", asset_id, "ask", ask["price"], ask["size"])
-
-        # Price change updates (dict format)
-        elif isinstance(data, dict):
-            for change in data.get("price_changes", []):
-                asset_id = change.get("asset_id")
-                side = change.get("side")
-                price = change.get("price")
-                size = change.get("size")
-                if asset_id and side and price is not None:
-                    book_side = "bid" if side == "BUY" else "ask"
-                    self.update_book_level(asset_id, "bids" if side == "BUY" else "asks", price, size)
-                    self.write_row("update", asset_id, book_side, price, size)
+        events = decode(message)
+        if events:
+            self.process_events(events)
+
+    def process_events(self, events: list):
+        """Apply and record decoded book events (also called by a shared feed)."""
+        for event in events:
+            asset_id = event.asset_id
+            if type(event) is PriceChange:
+                book_side = "bid" if event.side == "bids" else "ask"
+                self.update_book_level(asset_id, event.side, event.price, event.size)
+                self.write_row("update", asset_id, book_side, event.price, event.size)
+            else:
+                book = self.orderbooks.get(asset_id)
+                if book is None:
+                    book = self.orderbooks[asset_id] = OrderBook()
+                book.load_snapshot(event.bids, event.asks)
+                for price, size in event.bids:
+                    self.write_row("snapshot", asset_id, "bid", price, size)
+                for price, size in event.asks:
+                    self.write_row("snapshot", asset_id, "ask", price, size)
 
     def on_open(self, ws):
         """Subscribe to market tokens."""
         subscribe_msg = {"assets_ids": [self.up_token, self.down_token], "type": "market"}
         ws.send(json.dumps(subscribe_msg))
 
-        def ping_loop():
-            while self.running:
-                try:
-                    ws.send("PING")
-                    time.sleep(10)
-                except:
-                    break
-
         self.running = True
-        threading.Thread(target=ping_loop, daemon=True).start()
-
-        # Status refresh thread
-        def status_loop():
-            while self.running:
-                self.print_status()
-                time.sleep(2)
+        self.cancel_timers()
+        scheduler = get_scheduler()
+        self._timers = [
+            scheduler.call_every(10, self._ping, ws),
+            scheduler.call_every(2, self.print_status),
+        ]
+
+    def _ping(self, ws):
+        try:
+            ws.send("PING")
+        except Exception:
+            pass
 
-        threading.Thread(target=status_loop, daemon=True).start()
+    def cancel_timers(self):
+        for timer in self._timers:
+            timer.cancel()
+        self._timers = []
 
     def on_error(self, ws, error):
         pass
 
     def on_close(self, ws, code, msg):
         self.running = False
+        self.cancel_timers()
+
+    # Shared-feed handler hooks (status is rendered by the host)
+    def on_feed_open(self):
+        self.running = True
+
+    def on_feed_error(self, error):
+        pass
+
+    def on_feed_close(self, code):
+        self.running = False
 
     def print_status(self):
         """Print live status line."""
-        secs = max(0, self.interval_end_unix - int(time.time()))
+        secs = clock.seconds_until(self.interval_end_unix)
         mins = secs // 60
         s = secs % 60
         up_ask = self.get_best_ask(self.up_token)
@@ -320,6 +281,7 @@ class OrderBookRecorder:
                 break
             time.sleep(1)
 
+        self.cancel_timers()
         self.close_csv()
 
     def run(self):
@@ -385,6 +347,10 @@ def main():
     else:
         markets = select_market()
 
+    # Resolve current and upcoming intervals in the background so boundaries hit a warm cache
+    get_scheduler().call_every(market_cache.PREFETCH_INTERVAL, market_cache.get_cache().prefetch, markets,
+                               offload=True, first_delay=0)
+
     if len(markets) == 1:
         asset, interval = markets[0]
         recorder = OrderBookRecorder(asset, interval)
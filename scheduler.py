@@ -0,0 +1,168 @@
+"""
+Shared timer-wheel scheduler for periodic work
+
+One thread owns every timer (feed PINGs, status refreshes, resync deadlines,
+interval-boundary checks) instead of a sleeping thread per loop that lingers
+until some flag flips. Timers hash into a wheel of SLOTS buckets at TICK
+resolution, so arming and cancelling are O(1) and each tick only scans one
+bucket.
+
+Callbacks run on the wheel thread and must be short. Work that can block
+(HTTP lookups) is scheduled with offload=True and runs on a fixed worker
+pool; a periodic offloaded timer never overlaps itself. Blocking work that
+trading waits on (REST book seeding, order pre-signing, credential checks)
+passes priority=True instead and runs on a small pool of its own, so it
+never queues behind market lookups and other background work.
+
+Handles are cancellable and are tied to the lifetime of whatever armed them
+(a connection, a monitor). stats() reports live thread and timer counts so a
+long session can be checked for leaks.
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+TICK = 0.05    # Wheel resolution (seconds)
+SLOTS = 512    # Buckets per wheel revolution (~25s at TICK)
+WORKERS = 4    # Pool threads for offload=True callbacks
+PRIORITY_WORKERS = 2  # Pool threads for priority=True callbacks
+
+
+class TimerHandle:
+    """A scheduled callback. cancel() is safe from any thread and idempotent."""
+
+    __slots__ = ("callback", "args", "interval_ticks", "offload", "priority", "due", "cancelled", "running")
+
+    def __init__(self, callback, args: tuple, interval_ticks: int | None, offload: bool, priority: bool = False):
+        self.callback = callback
+        self.args = args
+        self.interval_ticks = interval_ticks
+        self.offload = offload or priority
+        self.priority = priority
+        self.due = 0
+        self.cancelled = False
+        self.running = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """Hashed timer wheel driven by one thread."""
+
+    def __init__(self, tick: float = TICK, slots: int = SLOTS, workers: int = WORKERS,
+                 priority_workers: int = PRIORITY_WORKERS):
+        self.tick = tick
+        self._wheel = [[] for _ in range(slots)]
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._now_tick = 0  # Last tick processed
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scheduler-worker")
+        self._priority_pool = ThreadPoolExecutor(max_workers=priority_workers, thread_name_prefix="scheduler-priority")
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="scheduler")
+        self._thread.start()
+
+    def call_later(self, delay: float, callback, *args, offload: bool = False, priority: bool = False) -> TimerHandle:
+        """Run callback(*args) once after delay seconds (priority=True: offloaded to the priority pool)."""
+        handle = TimerHandle(callback, args, None, offload, priority)
+        self._arm(handle, self._now_tick + self._ticks(delay))
+        return handle
+
+    def call_every(self, interval: float, callback, *args, offload: bool = False, priority: bool = False,
+                   first_delay: float | None = None) -> TimerHandle:
+        """Run callback(*args) every interval seconds until the handle is cancelled."""
+        handle = TimerHandle(callback, args, self._ticks(interval), offload, priority)
+        delay = interval if first_delay is None else first_delay
+        self._arm(handle, self._now_tick + self._ticks(delay))
+        return handle
+
+    def stats(self) -> dict:
+        """Live thread count (whole process) and armed timer count."""
+        with self._lock:
+            timers = sum(1 for bucket in self._wheel for handle in bucket if not handle.cancelled)
+        return {"threads": threading.active_count(), "timers": timers}
+
+    def stop(self):
+        self._stopped.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._priority_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _ticks(self, seconds: float) -> int:
+        return max(1, math.ceil(seconds / self.tick))
+
+    def _arm(self, handle: TimerHandle, due: int):
+        with self._lock:
+            # The wheel may have passed due since the caller read _now_tick: a
+            # bucket behind it would only be scanned again a revolution later
+            due = max(due, self._now_tick + 1)
+            handle.due = due
+            self._wheel[due % len(self._wheel)].append(handle)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            next_at = self._start + (self._now_tick + 1) * self.tick
+            delay = next_at - time.monotonic()
+            if delay > 0 and self._stopped.wait(delay):
+                break
+            self._advance()
+
+    def _advance(self):
+        """Process every tick up to now (catches up after a stall), then fire what's due."""
+        target = int((time.monotonic() - self._start) / self.tick)
+        due = []
+        with self._lock:
+            wheel = self._wheel
+            while self._now_tick < target:
+                self._now_tick += 1
+                index = self._now_tick % len(wheel)
+                bucket = wheel[index]
+                if not bucket:
+                    continue
+                keep = []
+                for handle in bucket:
+                    if handle.cancelled:
+                        continue
+                    if handle.due <= self._now_tick:
+                        due.append(handle)
+                    else:
+                        keep.append(handle)
+                wheel[index] = keep
+
+        for handle in due:
+            if handle.interval_ticks is not None:
+                # Re-arm from the due tick, not from now, so periods don't drift
+                self._arm(handle, handle.due + handle.interval_ticks)
+            if handle.offload:
+                if handle.running:
+                    continue  # Previous run still in progress: skip rather than pile up
+                handle.running = True
+                pool = self._priority_pool if handle.priority else self._pool
+                pool.submit(self._invoke, handle)
+            else:
+                self._invoke(handle)
+
+    @staticmethod
+    def _invoke(handle: TimerHandle):
+        try:
+            if not handle.cancelled:
+                handle.callback(*handle.args)
+        except Exception:
+            pass  # A failing callback must not take the wheel down
+        finally:
+            handle.running = False
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """Process-wide scheduler, started on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
@@ -13,13 +13,14 @@ import os
 import sys
 import json
 import time
+import queue
 import logging
 import requests
 import threading
+from enum import Enum
 from pathlib import Path
-from datetime import datetime, timedelta, timezone
-from zoneinfo import ZoneInfo
-from websocket import WebSocketApp
+from typing import NamedTuple
+from datetime import datetime, timezone
 
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import OrderArgs, OrderType
@@ -33,11 +34,19 @@ from rich.live import Live
 from rich.table import Table
 from rich.text import Text
 
+import clock
+import feed_health
+import latency
+import market_cache
+from decoder import BookEvent, PriceChange
+from feed import MarketFeed
+from orderbook import OrderBook, PRICE_SCALE, SIZE_SCALE, price_to_ticks, ticks_to_price
+from scheduler import Scheduler, get_scheduler
+
 load_dotenv()
 
 # API Configuration
 CLOB_HOST = "https://clob.polymarket.com"
-GAMMA_HOST = "https://gamma-api.polymarket.com"
 WS_URL = "wss://ws-subscriptions-clob.polymarket.com"
 PRIVATE_KEY = os.getenv("PRIVATE_KEY")
 FUNDER = os.getenv("FUNDER_ADDRESS")
@@ -59,46 +68,90 @@ PRICE_TIERS = {
     5:  [(10, 0.98)],
 }
 
+# PRICE_TIERS converted to integer ticks once at import (strategy path compares ints)
+_PRICE_TIERS_TICKS = {
+    interval: [(threshold, price_to_ticks(price)) for threshold, price in tiers]
+    for interval, tiers in PRICE_TIERS.items()
+}
+
+# Opportunity bounds in ticks
+PRICE_EPSILON_TICKS = price_to_ticks(0.005)   # accept asks up to $0.005 below target
+MAX_PRICE_TICKS = price_to_ticks(0.995)       # never buy at >= $0.995 (no edge left)
+CENT_TICKS = price_to_ticks(0.01)             # order prices are whole cents
+
+
+def compile_tier_schedule(interval_end_unix: float, interval_minutes: int = 15) -> list[tuple[float, int]]:
+    """Target price in ticks for one interval as ascending (activate_at, target) steps.
 
-def get_target_price(seconds_remaining: int, interval_minutes: int = 15) -> float | None:
-    """Get target price based on time remaining until resolution. Returns None if not in trading window."""
-    tiers = PRICE_TIERS.get(interval_minutes, [])
-    for threshold, price in tiers:
-        if seconds_remaining < threshold:
-            return price
-    return None  # Not in active trading window
+    No target applies before the first step (not in the trading window); each
+    step holds until the next one (the last through resolution). Where tiers
+    overlap, the first one listed in PRICE_TIERS wins.
+    """
+    tiers = _PRICE_TIERS_TICKS.get(interval_minutes, [])
+    steps = []
+    for threshold in sorted({threshold for threshold, _ in tiers}, reverse=True):
+        # Just after interval_end_unix - threshold, remaining time is < threshold
+        target = next(price for t, price in tiers if threshold <= t)
+        if not steps or steps[-1][1] != target:
+            steps.append((interval_end_unix - threshold, target))
+    return steps
 
 # Trading Configuration
 EXECUTE_TRADES = True  # Set to True to enable actual trading
 MAX_POSITION_SIZE = 10  # Maximum USDC per trade
 MIN_ORDER_VALUE = 5    # Skip trades below this USDC (not worth the fees)
 AUTO_SNIPE = True  # Automatically execute when opportunity found
+RESYNC_TIMEOUT = 10  # Seconds to wait for resync snapshots before abandoning the shadow books
+FEED_CONNECTIONS = 1  # Shared WebSocket connections carrying all monitored markets
+FEED_REDUNDANCY = 1  # 2 = subscribe every market on two connections; first copy of each frame wins
+PRESUBSCRIBE_LEAD = 120  # Seconds before the boundary to resolve and subscribe the next interval
+CONFLATE_UPDATES = True  # Apply every frame but evaluate once per drained burst
+CONFLATION_MAX_DELAY_MS = 50  # Hard cap on how long a burst may defer evaluation
+SNIPE_DEPTH_BAND = 0.01  # FOK limit sits this far above the best ask; size uses all ask depth up to the limit
+PRESIGN_LEAD = 30  # Seconds before the trading window to sign candidate orders
+ORDER_WORKERS = 4  # Executor threads submitting orders (different markets submit concurrently)
+ORDER_QUEUE_SIZE = 16  # Order intents waiting for a worker before new ones are turned away
+RETRY_BACKOFF_BASE = 0.2  # Seconds before retrying a killed FOK on the same market, doubling per failure
+RETRY_BACKOFF_MAX = 2.0  # Cap on that backoff
+RETRY_SIZE_DECAY = 0.5  # Each failure trusts this fraction less of the visible depth when sizing the retry
+RETRY_MIN_SIZE_FACTOR = 0.25  # Retries always size to at least this fraction of visible depth
+RETRY_PARTIAL_FILLS = False  # Retries go out fill-and-kill (FAK), keeping whatever part fills
+CREDS_REFRESH_SECS = 1800  # Re-derive API credentials in the background this often
+CREDS_VALIDATE_LEAD = 45  # Seconds before a trading window to validate credentials
+CLOB_WARM_SECS = 20  # Keep-alive request interval so the first order reuses a warm connection
 
 # Global trading client
 _trading_client = None
-_trade_lock = threading.Lock()
-_print_lock = threading.Lock()
+_client_lock = threading.Lock()
+_trade_lock = threading.Lock()  # Guards monitors' snipe flags (not order submission)
+_order_locks = {}  # {market label: Lock}; one order in flight per market, markets submit concurrently
 
 # Rich console for display
 _console = Console()
-_live = None  # Will be initialized in main
+STATUS_REFRESH_HZ = 4  # Renderer redraw rate (independent of market data)
+MONITOR_REFRESH_SECS = 2  # Periodic re-evaluation when no WS messages arrive
 
-# Per-asset status data (for rich table)
-_asset_status = {}  # {label: status_string}
-_asset_order = []   # ordered list of labels for consistent display
+# Per-asset status snapshots (for rich table), published lock-free by monitors.
+# Dict insertion order gives a consistent display order.
+_asset_status = {}  # {label: StatusSnapshot}
 
-# Gate output until all WebSockets are connected
+# Shared market-data feed (connects lazily on first subscribe)
+_market_feed = MarketFeed(f"{WS_URL}/ws/market", FEED_CONNECTIONS, redundancy=FEED_REDUNDANCY)
+
+# Gate output until all markets are subscribed
 _connected_count = 0
 _connected_lock = threading.Lock()
 _expected_connections = len(MONITORED_ASSETS)
-_all_connected = False
 
-# Position tracking
-_positions = {}  # {asset: {"side": str, "size": int, "price": float, "cost": float}}
-_total_exposure = 0.0
+# Position tracking (prices and costs in ticks: shares * price_ticks)
+_positions = {}  # {asset: {"side": str, "size": int, "price": int, "cost": int}}
+_reserved = {}  # {asset: cost} held by in-flight orders
+_total_exposure = 0  # Filled positions plus reservations
 _position_lock = threading.Lock()
 MAX_TOTAL_EXPOSURE = 500  # Maximum total USDC across all positions
 _balance_exhausted = False  # Set True on insufficient funds — stops all trading
+_integrity_failures = 0  # Times a monitor's book diverged from the feed (status footer)
+_conflated_frames = 0  # Evaluations skipped because more frames were queued (status footer)
 
 # Trade logger
 _trade_logger = None
@@ -123,33 +176,51 @@ def _setup_trade_logger():
     return logger
 
 
-def log_trade(asset: str, side: str, price: float, size: int, success: bool, order_id: str = "",
-              time_remaining=None, target_price=None):
-    """Log a trade to file."""
+def log_trade(asset: str, side: str, price: int, size: int, success: bool, order_id: str = "",
+              time_remaining=None, target_price=None, trace: latency.OrderTrace = None):
+    """Log a trade to file. Prices are in ticks; trace adds the attempt's latency breakdown."""
     global _trade_logger
     if _trade_logger is None:
         _trade_logger = _setup_trade_logger()
 
     status = "SUCCESS" if success else "FAILED"
-    cost = size * price
+    cost = ticks_to_price(size * price)
+    price = ticks_to_price(price)
     timer_str = f"timer={time_remaining}s" if time_remaining is not None else "timer=N/A"
-    target_str = f"target=${target_price:.2f}" if target_price else "target=N/A"
-    _trade_logger.info(f"{status} | {asset} | {side} | ${price:.4f} | {size} shares | ${cost:.2f} | {timer_str} | {target_str} | {order_id}")
+    target_str = f"target=${ticks_to_price(target_price):.2f}" if target_price else "target=N/A"
+    latency_str = f" | {trace.format()}" if trace is not None else ""
+    _trade_logger.info(f"{status} | {asset} | {side} | ${price:.4f} | {size} shares | ${cost:.2f} | {timer_str} | {target_str} | {order_id}{latency_str}")
+
 
+def reserve_exposure(asset: str, cost: int) -> bool:
+    """Claim cost (ticks) of exposure for an in-flight order on asset.
 
-def can_open_position(cost: float) -> bool:
-    """Check if we can open a position without exceeding max exposure."""
+    Check and claim are one step, so concurrent orders can't overshoot
+    MAX_TOTAL_EXPOSURE. False if over the limit or asset already has an order in flight.
+    """
+    global _total_exposure
     with _position_lock:
-        return (_total_exposure + cost) <= MAX_TOTAL_EXPOSURE
+        if asset in _reserved or _total_exposure + cost > MAX_TOTAL_EXPOSURE * PRICE_SCALE:
+            return False
+        _reserved[asset] = cost
+        _total_exposure += cost
+        return True
 
 
-def record_position(asset: str, side: str, size: int, price: float):
-    """Record a new position."""
+def commit_position(asset: str, side: str, size: int, price: int):
+    """Turn asset's reservation into a filled position. Price is in ticks."""
     global _total_exposure
     with _position_lock:
         cost = size * price
         _positions[asset] = {"side": side, "size": size, "price": price, "cost": cost}
-        _total_exposure += cost
+        _total_exposure += cost - _reserved.pop(asset, 0)
+
+
+def release_exposure(asset: str):
+    """Return asset's reservation (order not filled). No-op once committed."""
+    global _total_exposure
+    with _position_lock:
+        _total_exposure = max(0, _total_exposure - _reserved.pop(asset, 0))
 
 
 
@@ -163,122 +234,199 @@ def clear_position(asset: str):
             del _positions[asset]
 
 
-def _build_status_table() -> Table:
-    """Build a rich table from current asset status."""
+class MonitorState(Enum):
+    """What a monitor is doing, as shown on its status line."""
+    INFO = "info"            # connection/lifecycle message in StatusSnapshot.message
+    WARMING = "warming"
+    WAITING = "waiting"      # outside the trading window
+    ARMED = "armed"          # in the trading window, no opportunity yet
+    NO_DATA = "no_data"
+    STALE = "stale"
+    DIVERGED = "diverged"
+    FAILED = "failed"
+    SNIPED = "sniped"
+
+
+class StatusSnapshot(NamedTuple):
+    """Immutable per-monitor state published for the renderer. Prices are in ticks."""
+    label: str
+    state: MonitorState
+    seconds_remaining: int = 0
+    target: int | None = None
+    up_price: int = 0
+    down_price: int = 0
+    retry_count: int = 0
+    message: str = ""
+
+
+_STATE_STYLES = {
+    MonitorState.SNIPED: "bold green",
+    MonitorState.WARMING: "yellow",
+    MonitorState.NO_DATA: "red",
+    MonitorState.STALE: "red",
+    MonitorState.DIVERGED: "red",
+}
+
+
+def _format_status(snap: StatusSnapshot) -> str:
+    """Render a status snapshot as a one-line status string."""
+    if snap.state is MonitorState.INFO:
+        return snap.message
+
+    mins, secs = divmod(snap.seconds_remaining, 60)
+    tag = f"[{snap.label}]".ljust(10)
+    target_display = f"${ticks_to_price(snap.target):.2f}" if snap.target else "---"
+    status = (
+        f"{tag} "
+        f"⏱️ {mins:02d}:{secs:02d} | "
+        f"🎯 {target_display} | "
+        f"UP: ${ticks_to_price(snap.up_price):.2f} | "
+        f"DOWN: ${ticks_to_price(snap.down_price):.2f} | "
+    )
+    if snap.state is MonitorState.WARMING:
+        status += "⏳ Warming up"
+    elif snap.state is MonitorState.WAITING:
+        status += "⏳ Waiting ..."
+    elif snap.state is MonitorState.NO_DATA:
+        status += "⚠️ No orderbook data"
+    elif snap.state is MonitorState.STALE:
+        status += f"⚠️ Stale (sum=${ticks_to_price(snap.up_price + snap.down_price):.2f})"
+    elif snap.state is MonitorState.DIVERGED:
+        status += "⚠️ Book diverged from feed"
+    elif snap.state is MonitorState.FAILED:
+        status += f"❌ Failed (retry #{snap.retry_count})"
+    elif snap.state is MonitorState.SNIPED:
+        status += "✅ SNIPED!"
+    return status
+
+
+def _build_status_table(stats: dict | None = None) -> Table:
+    """Build a rich table from the latest published status snapshots, plus runtime stats if given."""
     table = Table(show_header=False, box=None, padding=(0, 1))
     table.add_column("Status", style="white", no_wrap=True)
 
-    for label in _asset_order:
-        status = _asset_status.get(label, "")
-        # Color based on content
-        if "SNIPED" in status:
-            style = "bold green"
-        elif "Warming" in status:
-            style = "yellow"
-        elif "Stale" in status or "⚠️" in status:
+    for snap in list(_asset_status.values()):
+        style = _STATE_STYLES.get(snap.state, "white")
+        if snap.state is MonitorState.INFO and "⚠️" in snap.message:
             style = "red"
-        else:
-            style = "white"
-        table.add_row(Text(status, style=style))
+        table.add_row(Text(_format_status(snap), style=style))
 
+    if stats:
+        table.add_row(Text(" | ".join(f"{name}: {value}" for name, value in stats.items()), style="dim"))
     return table
 
 
-def _refresh_status():
-    """Refresh the live display."""
-    global _live
-    if _live is not None:
-        try:
-            _live.update(_build_status_table())
-        except Exception:
-            pass  # Ignore display errors
-
+def _publish_status(snap: StatusSnapshot):
+    """Publish a monitor's latest state. Lock-free: a single dict assignment."""
+    _asset_status[snap.label] = snap
 
 
 def _update_asset_status(label: str, status: str):
-    """Thread-safe update of an asset's status line."""
-    global _all_connected
-    with _print_lock:
-        if label not in _asset_order:
-            _asset_order.append(label)
-
-        _asset_status[label] = status
-
-        if _all_connected and _live is not None:
-            _refresh_status()
+    """Publish a free-text (connection/lifecycle) status line for an asset."""
+    _publish_status(StatusSnapshot(label, MonitorState.INFO, message=status))
 
 
 def get_trading_client(force_refresh=False):
     """Get or create the trading client. Use force_refresh=True to recreate on errors."""
     global _trading_client
-    if _trading_client is None or force_refresh:
-        if not PRIVATE_KEY or not FUNDER:
-            raise ValueError("PRIVATE_KEY and FUNDER_ADDRESS required for trading")
-        _trading_client = ClobClient(CLOB_HOST, key=PRIVATE_KEY, chain_id=POLYGON, signature_type=2, funder=FUNDER)
-        _trading_client.set_api_creds(_trading_client.create_or_derive_api_creds())
-    return _trading_client
+    with _client_lock:
+        if _trading_client is None or force_refresh:
+            if not PRIVATE_KEY or not FUNDER:
+                raise ValueError("PRIVATE_KEY and FUNDER_ADDRESS required for trading")
+            _trading_client = ClobClient(CLOB_HOST, key=PRIVATE_KEY, chain_id=POLYGON, signature_type=2, funder=FUNDER)
+            _trading_client.set_api_creds(_trading_client.create_or_derive_api_creds())
+            _presigned.invalidate()  # Signed by the previous client
+        return _trading_client
+
+
+class CredentialManager:
+    """Keeps the trading client's API credentials valid and its CLOB connection warm, off the trade path.
+
+    Credentials are re-derived every CREDS_REFRESH_SECS and checked with a
+    cheap authenticated call (get_api_keys) shortly before each trading
+    window; a rejected check re-derives them then, rather than on a 403 in
+    the middle of a trade. A periodic unauthenticated request keeps the
+    client's pooled connection open so the first order skips TCP/TLS setup.
+    """
+
+    def __init__(self):
+        self.last_validated = None  # monotonic time of the last successful check
+        self._lock = threading.Lock()  # One refresh/validation at a time
+
+    def start(self, scheduler: Scheduler):
+        """Arm the background refresh, keep-alive and an immediate validation."""
+        scheduler.call_later(0, self.ensure_valid, offload=True)
+        scheduler.call_every(CREDS_REFRESH_SECS, self.refresh, offload=True)
+        scheduler.call_every(CLOB_WARM_SECS, self.warm, offload=True)
+
+    def refresh(self, validate: bool = True):
+        """Derive fresh credentials and swap them into the live client (blocking)."""
+        with self._lock:
+            try:
+                client = get_trading_client()
+                client.set_api_creds(client.create_or_derive_api_creds())
+            except Exception:
+                return
+        if validate:
+            self.validate()
+
+    def validate(self) -> bool:
+        """Authenticated round trip; re-derives credentials once if it's rejected (blocking)."""
+        for attempt in range(2):
+            with self._lock:
+                try:
+                    get_trading_client().get_api_keys()
+                    self.last_validated = time.monotonic()
+                    return True
+                except Exception as e:
+                    if attempt or not any(code in str(e) for code in ("401", "403")):
+                        return False
+                    try:
+                        client = get_trading_client()
+                        client.set_api_creds(client.create_or_derive_api_creds())
+                    except Exception:
+                        return False
+        return False
+
+    def ensure_valid(self, max_age: float = CREDS_VALIDATE_LEAD):
+        """Validate unless another caller already did within max_age seconds (monitors share windows)."""
+        if self.last_validated is None or time.monotonic() - self.last_validated > max_age:
+            self.validate()
+
+    def warm(self):
+        try:
+            get_trading_client().get_ok()
+        except Exception:
+            pass
 
+    def stats(self) -> dict:
+        if self.last_validated is None:
+            return {"creds": "not validated"} if EXECUTE_TRADES else {}
+        return {"creds validated": f"{time.monotonic() - self.last_validated:.0f}s ago"}
 
-def get_current_et_time():
-    """Get current time in Eastern Time."""
-    try:
-        return datetime.now(ZoneInfo("America/New_York"))
-    except Exception:
-        utc_now = datetime.now(timezone.utc)
-        et_offset = timedelta(hours=-5)  # EST
-        return utc_now + et_offset
 
+_credentials = CredentialManager()
 
-def get_interval_timestamp(interval_minutes: int = 15) -> int:
-    """Get Unix timestamp for the current interval (5m, 15m, etc)."""
-    et_now = get_current_et_time()
-    minute = (et_now.minute // interval_minutes) * interval_minutes
-    interval_time = et_now.replace(minute=minute, second=0, microsecond=0)
-    return int(interval_time.timestamp())
 
+def _market_lock(label: str) -> threading.Lock:
+    """Submission lock for one market (orders on different markets don't wait for each other)."""
+    return _order_locks.setdefault(label, threading.Lock())
 
-def generate_market_slug(base: str = "bitcoin", interval_minutes: int = 15) -> str:
-    """Generate market slug for current interval."""
-    base_short = {"bitcoin": "btc", "ethereum": "eth", "solana": "sol", "xrp": "xrp"}.get(base, base)
-    timestamp = get_interval_timestamp(interval_minutes)
-    return f"{base_short}-updown-{interval_minutes}m-{timestamp}"
+
+def generate_market_slug(base: str = "bitcoin", interval_minutes: int = 15, timestamp: int = None) -> str:
+    """Generate market slug for the current interval (or the interval starting at timestamp)."""
+    return clock.market_slug(base, interval_minutes, timestamp)
 
 
 def fetch_market_by_slug(slug: str) -> dict | None:
-    """Fetch market data by slug."""
+    """Fetch market data by slug (cached; misses do a hedged Gamma lookup on the pooled client)."""
     try:
-        # Try as event first
-        resp = requests.get(
-            f"{GAMMA_HOST}/events",
-            params={"slug": slug, "limit": 1},
-            timeout=10,
-        )
-        
-        if resp.status_code == 200:
-            data = resp.json()
-            if data and len(data) > 0:
-                return data[0]
-        
-        # Try as market
-        resp = requests.get(
-            f"{GAMMA_HOST}/markets",
-            params={"slug": slug, "limit": 1},
-            timeout=10,
-        )
-        
-        if resp.status_code == 200:
-            data = resp.json()
-            if data and len(data) > 0:
-                market = data[0]
-                return {"title": market.get("question", ""), "markets": [market], "slug": slug}
-        
-        return None
+        return market_cache.get_event(slug)
     except Exception as e:
         print(f"❌ Error fetching market: {e}")
         return None
 
 
-
 def send_discord_notification(title: str, message: str, color: int = 0x667eea, ping_everyone: bool = False):
     """Send a notification to Discord via webhook. Non-blocking (fire-and-forget)."""
     if not DISCORD_WEBHOOK_URL:
@@ -305,8 +453,12 @@ def send_discord_notification(title: str, message: str, color: int = 0x667eea, p
 
 class SniperMonitor:
     """WebSocket-based order book monitor for sniping near resolution."""
+
+    # Evaluations only queue orders (the executor submits them), so timers evaluate on the scheduler thread.
+    # Anything that reads or changes the books off the feed thread holds feed.dispatch_lock.
+    OFFLOAD_EVALUATION = False
     
-    def __init__(self, market_info: dict, asset_label: str = "", interval_end_unix: int = 0, asset_name: str = "", interval_minutes: int = 15, slug: str = ""):
+    def __init__(self, market_info: dict, asset_label: str = "", interval_end_unix: int = 0, asset_name: str = "", interval_minutes: int = 15, slug: str = "", feed: MarketFeed = None, standby: bool = False, scheduler: Scheduler = None):
         self.asset_label = asset_label.upper()
         self.asset_name = asset_name or asset_label.lower()
         self.interval_minutes = interval_minutes
@@ -325,382 +477,776 @@ class SniperMonitor:
         self.down_token = self.token_ids[self.down_idx] if len(self.token_ids) > self.down_idx else None
         
         # Order book state
-        self.orderbooks = {}
-        self.ws = None
-        self.running = False
+        self.orderbooks: dict[str, OrderBook] = {}
+        self.feed = feed or _market_feed
+        self.scheduler = scheduler or get_scheduler()
+        self._refresh_timer = None
+        self._resync_timer = None  # Fires at RESYNC_TIMEOUT so a stuck resync is abandoned on time
+        self._health_timer = None
+
+        # Stall supervision: arrival statistics are per market label, learned across intervals
+        self._arrivals = feed_health.arrival_stats(self.asset_label)
+        self._recovering_since = None  # monotonic time the feed was lost, until ready again
+        self._rest_seeded = False  # Books loaded from a REST snapshot since the feed was lost
+        self._next_stall_check = 0  # monotonic time before which another stall isn't acted on
+
+        # Trading-window tiers as absolute activation times; a timer evaluates at each one
+        self._tier_steps = compile_tier_schedule(interval_end_unix, interval_minutes)
+        self._tier_index = -1  # Current step (-1 = before the first tier)
+        self._tier_timers = []
+        self.standby = standby  # Pre-subscribed next interval: keep the book warm, don't trade or display
+        self.running = False  # Feed connection carrying our tokens is up
         self.snipe_executed = False
         self.warmed_up = False  # Skip initial stale book snapshots
         self.stopped = False
         self._attempting_snipe = False  # Flag to prevent concurrent snipe attempts
         self._last_resync = 0  # Timestamp of last resync attempt
+        self._diverged_assets = set()  # Tokens whose book disagrees with feed best_bid/best_ask or timestamps
+        self._last_feed_ts = {}  # {asset_id: last feed timestamp (ms)} for ordering checks
+        self._frame_marks = None  # perf_counter (received, applied) of the frame awaiting evaluation, for order traces
+
+        # Double-buffered resync: fresh snapshots build shadow books while the
+        # live books keep serving; deltas arriving meanwhile are replayed on swap
+        self._resync_pending = set()  # asset_ids still awaiting a resync snapshot
+        self._shadow_books = {}  # {asset_id: OrderBook} built from resync snapshots
+        self._shadow_deltas = {}  # {asset_id: [(side, price, size), ...]} since its shadow snapshot
+
+        # Conflation: evaluation deferred while a burst is still being received
+        self._eval_deferred_since = None  # monotonic time of the first deferred evaluation
+        self._conflation_timer = None  # Evaluates at CONFLATION_MAX_DELAY_MS if the feed never goes idle
         self._retry_count = 0  # Number of failed attempts this interval
-
-        # Current prices (updated in real-time)
-        self.up_price = 0.0
-        self.up_size = 0.0
-        self.down_price = 0.0
-        self.down_size = 0.0
+        self._retry_at = 0  # monotonic time before which no retry is sent (backoff)
+        self._size_factor = 1.0  # Fraction of visible depth the next attempt sizes to
+        self._attempt_top = None  # (token_id, best ask, depth) the in-flight attempt was sized from
+        self._rejected_top = None  # The same for the last failed attempt
+        self._presign_timer = None
+        self._validate_timer = None
+
+        # Current best asks (updated in real-time): prices in ticks, sizes in size units
+        self.up_price = 0
+        self.up_size = 0
+        self.down_price = 0
+        self.down_size = 0
     
-    def on_message(self, ws, message):
-        """Handle incoming WebSocket messages."""
-        if message == "PONG":
-            return
-        
-        try:
-            data = json.loads(message)
-            self.process_message(data)
-        except json.JSONDecodeError:
-            pass
+    def process_events(self, events: list):
+        """Apply decoded book events from one frame (called by the shared feed).
+
+        Strategy evaluation only runs when an update moved the top of the
+        UP or DOWN book (or on warmup); deep-level churn just updates the book.
+        """
+        received = self.feed.frame_received_at()
+        top_moved = False
+        reported_tops = {}  # {asset_id: (best_bid, best_ask, timestamp)} as of the last change per asset
+        if not self.standby:
+            self._arrivals.record(time.monotonic(), self.interval_end_unix - clock.now())
+        for event in events:
+            asset_id = event.asset_id
+            if type(event) is PriceChange:
+                top_moved |= self.update_book_level(asset_id, event.side, event.price, event.size)
+                reported_tops[asset_id] = (event.best_bid, event.best_ask, event.timestamp)
+                continue
+
+            # Book snapshot: a full load replaces whatever the book diverged on
+            self._last_feed_ts.pop(asset_id, None)
+            if asset_id in self._resync_pending:
+                self._load_shadow_book(asset_id, event)
+                continue
+            self._diverged_assets.discard(asset_id)
+            book = self.orderbooks.get(asset_id)
+            if book is None:
+                book = self.orderbooks[asset_id] = OrderBook()
+            top_moved |= book.load_snapshot(event.bids, event.asks)
+
+        applied = time.perf_counter()
+        if reported_tops:
+            self.verify_book_integrity(reported_tops)
+
+        # Mark warmed up after receiving book data
+        # prices_valid check in check_snipe_opportunity() handles stale data safety
+        was_warm = self.warmed_up
+        if not was_warm:
+            self._mark_ready()
+        if top_moved or not was_warm or self._eval_deferred_since is not None:
+            if self._frame_marks is None:
+                self._frame_marks = (received, applied)  # While conflating, traces start at the first deferred frame
+            self._request_evaluation()
+
+    def _request_evaluation(self):
+        """Evaluate now, or defer while more frames are queued (conflation), up to CONFLATION_MAX_DELAY_MS."""
+        global _conflated_frames
+        if CONFLATE_UPDATES:
+            now = time.monotonic()
+            deferred_ms = 0 if self._eval_deferred_since is None else (now - self._eval_deferred_since) * 1000
+            pending = any(self.feed.has_pending_data(token) for token in (self.up_token, self.down_token))
+            if deferred_ms < CONFLATION_MAX_DELAY_MS and pending:
+                if self._eval_deferred_since is None:
+                    self._eval_deferred_since = now
+                    # Other markets' frames can keep the feed busy past the cap: evaluate then regardless
+                    self._conflation_timer = self.scheduler.call_later(CONFLATION_MAX_DELAY_MS / 1000, self.on_feed_idle)
+                _conflated_frames += 1
+                self.feed.defer_until_idle(self)
+                return
+        self._run_deferred_evaluation()
+
+    def on_feed_idle(self):
+        """The feed drained its buffered frames (or the conflation cap passed): run any deferred evaluation."""
+        with self.feed.dispatch_lock:
+            if self._eval_deferred_since is not None:
+                self._run_deferred_evaluation()
+
+    def _run_deferred_evaluation(self):
+        self._eval_deferred_since = None
+        if self._conflation_timer:
+            self._conflation_timer.cancel()
+            self._conflation_timer = None
+        self.check_snipe_opportunity(self._take_frame_marks())
+
+    def _take_frame_marks(self) -> tuple:
+        """(received, applied) of the frame that requested this evaluation, consumed so no other evaluation reuses them."""
+        marks = self._frame_marks or (None, None)
+        self._frame_marks = None
+        return marks
+
+    def verify_book_integrity(self, reported_tops: dict):
+        """Flag a token as diverged if its local top disagrees with the feed or timestamps go backwards."""
+        global _integrity_failures
+        was_diverged = bool(self._diverged_assets)
+        for asset_id, (best_bid, best_ask, ts) in reported_tops.items():
+            book = self.orderbooks.get(asset_id)
+            if book is not None and not book.matches_top(best_bid, best_ask):
+                self._diverged_assets.add(asset_id)
+            if ts is not None:
+                if ts < self._last_feed_ts.get(asset_id, 0):
+                    self._diverged_assets.add(asset_id)
+                self._last_feed_ts[asset_id] = ts
+        if self._diverged_assets and not was_diverged:
+            _integrity_failures += 1
+
+    def _load_shadow_book(self, asset_id: str, event: BookEvent):
+        """Build a shadow book from a resync snapshot; swap all in once every pending asset has one."""
+        shadow = OrderBook()
+        shadow.load_snapshot(event.bids, event.asks)
+        self._shadow_deltas[asset_id] = []
+        self._shadow_books[asset_id] = shadow
+        self._resync_pending.discard(asset_id)
+        if not self._resync_pending:
+            self._swap_shadow_books()
+
+    def _swap_shadow_books(self):
+        """Replay buffered deltas onto the shadow books and swap them in atomically."""
+        self._cancel_resync_timer()
+        shadows = self._shadow_books
+        for asset_id, book in shadows.items():
+            for side, price, size in self._shadow_deltas.get(asset_id, ()):
+                book.update_level(side, price, size)
+        self._shadow_books = {}
+        self._shadow_deltas = {}
+        self.orderbooks = {**self.orderbooks, **shadows}
+        self._diverged_assets.difference_update(shadows)
+        self.check_snipe_opportunity()
+
+    def update_book_level(self, asset_id: str, side: str, price: str, size: str) -> bool:
+        """Update a single price level in the order book. Returns True if the top of book moved."""
+        deltas = self._shadow_deltas.get(asset_id)
+        if deltas is not None:
+            deltas.append((side, price, size))
+        book = self.orderbooks.get(asset_id)
+        if book is None:
+            book = self.orderbooks[asset_id] = OrderBook()
+        return book.update_level(side, price, size)
     
-    def process_message(self, data):
-        """Process order book update message."""
-        # Handle dict format (price_changes messages)
-        if isinstance(data, dict):
-            price_changes = data.get("price_changes", [])
-            for change in price_changes:
-                asset_id = change.get("asset_id")
-                side = change.get("side")
-                price = change.get("price")
-                size = change.get("size")
-
-                if asset_id and side and price is not None:
-                    if asset_id not in self.orderbooks:
-                        self.orderbooks[asset_id] = {"bids": [], "asks": []}
-                    book_side = "bids" if side == "BUY" else "asks"
-                    self.update_book_level(asset_id, book_side, price, size)
-
-            if price_changes:
-                self.warmed_up = True
-                self.check_snipe_opportunity()
-            return
-
-        # Handle list format (initial book snapshots)
-        if not isinstance(data, list):
-            return
-
-        for event in data:
-            event_type = event.get("event_type")
-            asset_id = event.get("asset_id")
-
-            if event_type == "book" and asset_id:
-                self.orderbooks[asset_id] = {
-                    "bids": event.get("bids", []),
-                    "asks": event.get("asks", [])
-                }
-                # Mark warmed up after receiving book snapshot
-                # prices_valid check in check_snipe_opportunity() handles stale data safety
-                self.warmed_up = True
-                self.check_snipe_opportunity()
-
-            elif event_type == "price_change" and asset_id:
-                if asset_id not in self.orderbooks:
-                    self.orderbooks[asset_id] = {"bids": [], "asks": []}
+    def check_snipe_opportunity(self, frame_marks: tuple = (None, None)):
+        """Check for snipe opportunity using WebSocket prices.
 
-                changes = event.get("changes", [])
-                for change in changes:
-                    side = change.get("side")
-                    price = change.get("price")
-                    size = change.get("size")
-
-                    if side and price is not None:
-                        book_side = "bids" if side == "BUY" else "asks"
-                        self.update_book_level(asset_id, book_side, price, size)
-
-                self.warmed_up = True
-                self.check_snipe_opportunity()
-    
-    def update_book_level(self, asset_id: str, side: str, price: str, size: str):
-        """Update a single price level in the order book."""
-        book = self.orderbooks.get(asset_id, {"bids": [], "asks": []})
-        levels = book.get(side, [])
-        
-        levels = [l for l in levels if l.get("price") != price]
-        
-        if float(size) > 0:
-            levels.append({"price": price, "size": size})
-        
-        if side == "bids":
-            levels.sort(key=lambda x: float(x["price"]), reverse=True)
-        else:
-            levels.sort(key=lambda x: float(x["price"]))
-        
-        book[side] = levels
-        self.orderbooks[asset_id] = book
-    
-    def check_snipe_opportunity(self):
-        """Check for snipe opportunity using WebSocket prices."""
+        frame_marks are the (received, applied) times of the frame that
+        triggered this evaluation; timer and refresh evaluations have none.
+        """
         if not self.up_token or not self.down_token:
             return
 
         # Use WebSocket orderbook for display (fast, no rate limits)
-        up_book = self.orderbooks.get(self.up_token, {})
-        down_book = self.orderbooks.get(self.down_token, {})
+        up_book = self.orderbooks.get(self.up_token)
+        down_book = self.orderbooks.get(self.down_token)
 
-        up_asks = up_book.get("asks", [])
-        down_asks = down_book.get("asks", [])
+        up_asks = up_book.best_ask() if up_book else None
+        down_asks = down_book.best_ask() if down_book else None
 
         # Update current prices from WebSocket (0 if no liquidity)
         if up_asks:
-            self.up_price = float(up_asks[0]["price"])
-            self.up_size = float(up_asks[0]["size"])
+            self.up_price, self.up_size = up_asks
         else:
-            self.up_price = 0.0
-            self.up_size = 0.0
+            self.up_price = 0
+            self.up_size = 0
 
         if down_asks:
-            self.down_price = float(down_asks[0]["price"])
-            self.down_size = float(down_asks[0]["size"])
+            self.down_price, self.down_size = down_asks
         else:
-            self.down_price = 0.0
-            self.down_size = 0.0
+            self.down_price = 0
+            self.down_size = 0
 
-        # Need at least one side to have data
-        if not up_asks and not down_asks:
+        # Need at least one side to have data; standby monitors only keep their book warm
+        if (not up_asks and not down_asks) or self.standby:
             return
         
-        # Build countdown MM:SS from slug's interval end (matches Polymarket server time)
-        total_secs = max(0, self.interval_end_unix - int(time.time()))
-        mins = total_secs // 60
-        secs = total_secs % 60
+        # Countdown from slug's interval end (clock is corrected to Polymarket server time)
+        now = clock.now()
+        total_secs = max(0, self.interval_end_unix - int(now))
 
         # Get dynamic target price based on time remaining (None = not in trading window)
-        target = get_target_price(total_secs, self.interval_minutes)
+        target = self._current_target(now)
         in_trading_window = target is not None
 
-        # Build status line (pad tag to align columns)
-        tag = f"[{self.asset_label}]" if self.asset_label else ""
-        tag = tag.ljust(10)
-        target_display = f"${target:.2f}" if target else "---"
-
-        status = (
-            f"{tag} "
-            f"⏱️ {mins:02d}:{secs:02d} | "
-            f"🎯 {target_display} | "
-            f"UP: ${self.up_price:.2f} | "
-            f"DOWN: ${self.down_price:.2f} | "
-        )
-
         # Sanity check: stale snapshots show both sides at ~$0.99 (sum ~$1.98)
         # Only check sum bounds when both sides have data; one-sided books are valid near resolution
         price_sum = self.up_price + self.down_price
         if self.up_price > 0 and self.down_price > 0:
-            min_sum = 0.30 if self.interval_minutes == 5 else 0.95
-            prices_valid = min_sum <= price_sum <= 1.15
+            min_sum = price_to_ticks(0.30 if self.interval_minutes == 5 else 0.95)
+            prices_valid = min_sum <= price_sum <= price_to_ticks(1.15)
         else:
             prices_valid = self.up_price > 0 or self.down_price > 0
 
-        # Auto-resync if prices are invalid (throttle to once per 3s)
-        # Also resync every 30s regardless to catch silent WebSocket stalls
-        # But NEVER resync during the trading window — would clear orderbook at worst time
+        # Auto-resync only when the book is detectably wrong: invalid prices or
+        # divergence from the feed's own best_bid/best_ask (throttle to once per 3s).
+        # Resync is double-buffered (live book keeps serving), so it is safe inside the trading window.
         time_since_resync = time.time() - self._last_resync
-        if not in_trading_window and self.warmed_up and ((not prices_valid and time_since_resync > 3) or (time_since_resync > 30)):
+        if self._resync_pending and time_since_resync > RESYNC_TIMEOUT:
+            self._abandon_resync()
+        needs_resync = not prices_valid or bool(self._diverged_assets)
+        if self.warmed_up and needs_resync and not self._resync_pending and time_since_resync > 3:
             self.resync_orderbook()
 
         # Check if price hits target
-        if not self.snipe_executed:
-            if not self.warmed_up:
-                status += "⏳ Warming up"
-            elif not in_trading_window:
-                status += "⏳ Waiting ..."
-            elif not prices_valid:
-                if self.up_price == 0 and self.down_price == 0:
-                    status += "⚠️ No orderbook data"
-                else:
-                    status += f"⚠️ Stale (sum=${price_sum:.2f})"
-            else:
-                opportunity = self.get_best_opportunity(target)
-
-                if opportunity:
-                    if EXECUTE_TRADES and AUTO_SNIPE:
-                        # Check if already sniped, currently attempting, or in cooldown
-                        with _trade_lock:
-                            if self.snipe_executed:
-                                status += "✅ SNIPED!"
-                                _update_asset_status(self.asset_label, status)
-                                return
-                            if self._attempting_snipe:
-                                _update_asset_status(self.asset_label, status)
-                                return
-                            self._attempting_snipe = True
-
-                        try:
-                            trade_context = {
-                                "time_remaining": total_secs,
-                                "target_price": target,
-                            }
-                            trade_result = execute_snipe(opportunity, target_price=target, monitor_label=self.asset_label, trade_context=trade_context)
-                            if trade_result:
-                                with _trade_lock:
-                                    self.snipe_executed = True
-                                status += "✅ SNIPED!"
-                                send_discord_notification(
-                                    f"✅ Trade Executed - {self.asset_label}",
-                                    f"**Slug:** `{self.slug}`\n**Side:** {opportunity['side']}\n**Price:** ${trade_result['price']:.2f}\n**Shares:** {trade_result['size']}\n**Cost:** ${trade_result['cost']:.2f}\n**Payout if win:** ${trade_result['payout']:.2f}\n**Expected return:** +${trade_result['payout'] - trade_result['cost']:.2f} ({((trade_result['payout'] - trade_result['cost']) / trade_result['cost']) * 100:.0f}%)\n**Timer:** {total_secs}s",
-                                    color=0x4ade80,
-                                )
-                            if not trade_result:
-                                self._retry_count += 1
-                                status += f"❌ Failed (retry #{self._retry_count})"
-                                if self._retry_count == 1:
-                                    send_discord_notification(
-                                        f"❌ Trade Failed - {self.asset_label}",
-                                        f"**Slug:** `{self.slug}`\n**Side:** {opportunity['side']}\n**Price:** ${opportunity['price']:.2f}\n**Timer:** {total_secs}s\n**Retrying...**",
-                                        color=0xef4444,
-                                    )
-                        finally:
-                            self._attempting_snipe = False
-                        _update_asset_status(self.asset_label, status)
-                    return
-        elif self.snipe_executed:
-            status += "✅ SNIPED!"
-
-        _update_asset_status(self.asset_label, status)
+        state = MonitorState.ARMED
+        if self.snipe_executed:
+            state = MonitorState.SNIPED
+        elif not self.warmed_up:
+            state = MonitorState.WARMING
+        elif not in_trading_window:
+            state = MonitorState.WAITING
+        elif not prices_valid:
+            state = MonitorState.NO_DATA if price_sum == 0 else MonitorState.STALE
+        elif self._diverged_assets:
+            state = MonitorState.DIVERGED
+        else:
+            opportunity = self.get_best_opportunity(target)
+            detected = time.perf_counter()
+            if self._retry_count:
+                state = MonitorState.FAILED
+
+            if opportunity and EXECUTE_TRADES and AUTO_SNIPE and self._retry_allowed(opportunity):
+                # Check if already sniped, currently attempting, or in cooldown
+                with _trade_lock:
+                    if self.snipe_executed:
+                        self._publish(MonitorState.SNIPED, total_secs, target)
+                        return
+                    if self._attempting_snipe:
+                        self._publish(state, total_secs, target)
+                        return
+                    self._attempting_snipe = True
+
+                received, applied = frame_marks
+                opportunity["trace"] = latency.OrderTrace(received=received, applied=applied, detected=detected)
+                self._attempt_top = (opportunity["token_id"], opportunity["price"], opportunity["size"])
+                self._size_for_retry(opportunity)
+                submitted = self._submit_snipe(opportunity, total_secs, target)
+                if not self._retry_count:
+                    state = submitted  # A queued retry keeps showing the failure it follows
+
+        self._publish(state, total_secs, target)
+
+    def _retry_allowed(self, opportunity: dict) -> bool:
+        """After a failed attempt: only retry once the backoff has passed and the top of book has changed."""
+        global _retries_suppressed
+        if not self._retry_count:
+            return True
+        top = (opportunity["token_id"], opportunity["price"], opportunity["size"])
+        if time.monotonic() < self._retry_at or top == self._rejected_top:
+            _retries_suppressed += 1
+            return False
+        return True
+
+    def _size_for_retry(self, opportunity: dict):
+        """After a failed attempt the visible depth overstated what filled: size to a fraction of it."""
+        if self._retry_count:
+            opportunity["size"] = int(opportunity["size"] * self._size_factor)
+            opportunity["partial"] = RETRY_PARTIAL_FILLS
+
+    def _reprice(self, target: int) -> dict | None:
+        """Current opportunity for resubmitting an order (after a credential refresh), sized like the original."""
+        with self.feed.dispatch_lock:
+            opportunity = self.get_best_opportunity(target)
+            if opportunity is not None:
+                self._size_for_retry(opportunity)
+        return opportunity
+
+    def _current_target(self, now: float) -> int | None:
+        """Target price in ticks at time now (None = not in trading window). Amortised O(1)."""
+        steps = self._tier_steps
+        i = self._tier_index
+        while i + 1 < len(steps) and now >= steps[i + 1][0]:
+            i += 1
+        self._tier_index = i
+        return steps[i][1] if i >= 0 else None
+
+    def _submit_snipe(self, opportunity: dict, total_secs: int, target: int) -> MonitorState:
+        """Queue the order for the executor and return at once, so the feed thread keeps applying updates.
+
+        The executor clears _attempting_snipe and publishes the result (_execute_intent).
+        """
+        if not _order_executor.submit(OrderIntent(self, opportunity, total_secs, target)):
+            self._attempting_snipe = False  # Executor backed up: the next evaluation tries again
+        return MonitorState.ARMED
+
+    def _execute_intent(self, intent: "OrderIntent"):
+        """Submit a queued order (executor thread) and apply the result."""
+        try:
+            if self.stopped or self.snipe_executed:
+                return
+            trade_context = {
+                "time_remaining": intent.total_secs,
+                "target_price": intent.target,
+            }
+            trade_result = execute_snipe(intent.opportunity, target_price=intent.target, monitor_label=self.asset_label,
+                                         trade_context=trade_context, reprice=lambda: self._reprice(intent.target))
+            state = self._on_snipe_result(trade_result, intent.opportunity, intent.total_secs)
+        finally:
+            self._attempting_snipe = False
+        self._publish(state, clock.seconds_until(self.interval_end_unix), intent.target)
+
+    def _on_snipe_result(self, trade_result: dict | None, opportunity: dict, total_secs: int) -> MonitorState:
+        """Record a snipe outcome (flags, retry count, notifications) and return the new state."""
+        if trade_result:
+            with _trade_lock:
+                self.snipe_executed = True
+            send_discord_notification(
+                f"✅ Trade Executed - {self.asset_label}",
+                f"**Slug:** `{self.slug}`\n**Side:** {opportunity['side']}\n**Price:** ${trade_result['price']:.2f}\n**Shares:** {trade_result['size']}\n**Cost:** ${trade_result['cost']:.2f}\n**Payout if win:** ${trade_result['payout']:.2f}\n**Expected return:** +${trade_result['payout'] - trade_result['cost']:.2f} ({((trade_result['payout'] - trade_result['cost']) / trade_result['cost']) * 100:.0f}%)\n**Timer:** {total_secs}s",
+                color=0x4ade80,
+            )
+            return MonitorState.SNIPED
+
+        with self.feed.dispatch_lock:  # The feed thread reads the retry state on every evaluation
+            self._retry_count += 1
+            self._retry_at = time.monotonic() + min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (self._retry_count - 1))
+            self._size_factor = max(RETRY_MIN_SIZE_FACTOR, self._size_factor * RETRY_SIZE_DECAY)
+            self._rejected_top = self._attempt_top
+        self.scheduler.call_later(0, self.presign_orders, priority=True)  # Replace the order just used
+        if self._retry_count == 1:
+            send_discord_notification(
+                f"❌ Trade Failed - {self.asset_label}",
+                f"**Slug:** `{self.slug}`\n**Side:** {opportunity['side']}\n**Price:** ${ticks_to_price(opportunity['price']):.2f}\n**Timer:** {total_secs}s\n**Retrying...**",
+                color=0xef4444,
+            )
+        return MonitorState.FAILED
+
+    def _set_status(self, message: str):
+        """Publish a free-text status line (suppressed while on standby)."""
+        if not self.standby:
+            _update_asset_status(self.asset_label, f"[{self.asset_label}]".ljust(12) + message)
+
+    def promote(self):
+        """Take over from the previous interval's monitor at the boundary."""
+        with self.feed.dispatch_lock:
+            self.standby = False
+            self._arrivals.reset(time.monotonic())
+            self.check_snipe_opportunity()
+
+    def _publish(self, state: MonitorState, seconds_remaining: int, target: int | None):
+        """Publish this monitor's current state for the renderer."""
+        _publish_status(StatusSnapshot(
+            self.asset_label, state, seconds_remaining, target,
+            self.up_price, self.down_price, self._retry_count,
+        ))
     
-    def get_best_opportunity(self, target_price: float) -> dict | None:
-        """Buy any side at >= target price."""
+    def get_best_opportunity(self, target_price: int) -> dict | None:
+        """Buy any side at >= target price (ticks).
+
+        "price" is the best ask; "limit" is the FOK limit (whole cents, below
+        MAX_PRICE_TICKS) and "size" the cumulative ask depth up to that limit.
+        """
         opportunities = []
-        epsilon = 0.005
-        max_price = 0.995
-        if self.up_price > 0 and self.up_price < max_price and self.up_price >= (target_price - epsilon) and self.up_size > 0:
-            opportunities.append({
-                "side": "UP",
-                "outcome": self.outcomes[self.up_idx],
-                "token_id": self.up_token,
-                "price": self.up_price,
-                "size": self.up_size,
-            })
-
-        if self.down_price > 0 and self.down_price < max_price and self.down_price >= (target_price - epsilon) and self.down_size > 0:
-            opportunities.append({
-                "side": "DOWN",
-                "outcome": self.outcomes[self.down_idx],
-                "token_id": self.down_token,
-                "price": self.down_price,
-                "size": self.down_size,
-            })
+        min_price = target_price - PRICE_EPSILON_TICKS
+        if 0 < self.up_price < MAX_PRICE_TICKS and self.up_price >= min_price and self.up_size > 0:
+            opportunities.append(self._build_opportunity("UP", self.up_idx, self.up_token, self.up_price))
 
+        if 0 < self.down_price < MAX_PRICE_TICKS and self.down_price >= min_price and self.down_size > 0:
+            opportunities.append(self._build_opportunity("DOWN", self.down_idx, self.down_token, self.down_price))
+
+        opportunities = [o for o in opportunities if o["size"] > 0]
         if not opportunities:
             return None
         return max(opportunities, key=lambda x: x["price"])
 
-    def on_error(self, ws, error):
-        """Handle WebSocket errors."""
-        _update_asset_status(self.asset_label, f"[{self.asset_label}]".ljust(12) + f"| ❌ WebSocket error: {str(error)[:30]}")
+    def _build_opportunity(self, side: str, outcome_idx: int, token_id: str, best_ask: int) -> dict:
+        """Size an opportunity from cumulative book depth up to the FOK limit price."""
+        limit = fok_limit(best_ask)
+        book = self.orderbooks.get(token_id)
+        return {
+            "side": side,
+            "outcome": self.outcomes[outcome_idx],
+            "token_id": token_id,
+            "price": best_ask,
+            "limit": limit,
+            "size": book.ask_depth(limit) if book else 0,
+            "vwap": book.ask_vwap(limit) if book else 0.0,
+        }
 
-    def on_close(self, ws, close_status_code, close_msg):
-        """Handle WebSocket close."""
-        _update_asset_status(self.asset_label, f"[{self.asset_label}]".ljust(12) + f"| 🔌 WebSocket closed (code={close_status_code})")
-        self.running = False
+    def on_feed_error(self, error):
+        """Handle errors on the feed connection carrying our tokens."""
+        self._set_status(f"| ❌ WebSocket error: {str(error)[:30]}")
 
-    def on_open(self, ws):
-        """Handle WebSocket connection open."""
-        global _connected_count
+    def on_feed_close(self, close_status_code):
+        """Handle the feed connection dropping (the feed reconnects on its own).
 
-        # Reset warmup on reconnect so we don't trade on stale data
+        The book is stale from here, so warmup resets now; a REST snapshot is
+        fetched while the feed reconnects so we're ready as soon as it's back.
+        """
+        self._set_status(f"| 🔌 WebSocket closed (code={close_status_code}), reconnecting...")
+        self.running = False
         self.warmed_up = False
+        self._rest_seeded = False
+        if self._recovering_since is None:
+            self._recovering_since = time.monotonic()
+        if not self.stopped:
+            self._seed_books()
+
+    def on_feed_open(self):
+        """Handle our tokens being subscribed on a live feed connection."""
+        global _connected_count
 
         # Track connections
         with _connected_lock:
             _connected_count += 1
 
-        # Subscribe to market tokens
-        subscribe_msg = {
-            "assets_ids": [self.up_token, self.down_token],
-            "type": "market"
-        }
-        ws.send(json.dumps(subscribe_msg))
+        self.running = True
+        if not self.standby:
+            self._arrivals.reset(time.monotonic())
+        if self._rest_seeded:
+            self._mark_ready()  # REST snapshot landed while reconnecting: no need to wait for the WS one
+
+    def check_feed_health(self):
+        """Supervisor tick: act if our frames stopped for longer than this phase allows.
+
+        If the connection carrying our tokens went silent as a whole it is
+        reconnected; if other markets on it are still flowing only ours went
+        quiet, and our books are re-requested instead.
+        """
+        if self.standby or not self.running or not self.warmed_up:
+            return
+        now = time.monotonic()
+        seconds_remaining = self.interval_end_unix - clock.now()
+        if now < self._next_stall_check or not self._arrivals.stalled(now, seconds_remaining):
+            return
+        self._next_stall_check = now + feed_health.STALL_COOLDOWN
+        if self.feed.silence([self.up_token, self.down_token], now) < self._arrivals.threshold(seconds_remaining):
+            self._set_status(f"| 🩺 Market silent {self._arrivals.silence(now):.1f}s, resyncing book...")
+            with self.feed.dispatch_lock:
+                self.resync_orderbook()
+            return
+        feed_health.recovery.record_stall()
+        self._set_status(f"| 🩺 Feed silent {self._arrivals.silence(now):.1f}s, reconnecting...")
+        self._recovering_since = now
+        self.feed.reconnect([self.up_token, self.down_token])
 
-        # Start ping thread
-        def ping_loop():
-            while self.running:
-                try:
-                    ws.send("PING")
-                    time.sleep(10)
-                except:
-                    break
+    def _seed_books(self):
+        """Fetch a REST book snapshot off the feed thread (see _apply_rest_books)."""
+        self.scheduler.call_later(0, self._fetch_rest_books, priority=True)
 
-        self.running = True
-        threading.Thread(target=ping_loop, daemon=True).start()
+    def _fetch_rest_books(self):
+        try:
+            books = feed_health.fetch_books(CLOB_HOST, [self.up_token, self.down_token])
+        except Exception:
+            return  # The WS snapshot after reconnect still warms the book
+        self._apply_rest_books(books)
 
-        # Start periodic status refresh thread (keeps display alive when no WS messages)
-        def refresh_loop():
-            while self.running:
-                try:
-                    self.check_snipe_opportunity()
-                    time.sleep(2)
-                except:
-                    pass
+    def _apply_rest_books(self, books: list):
+        """Load REST snapshots unless WS data already arrived (it's newer); ready now if the feed is back."""
+        if self.stopped or self.warmed_up or not books:
+            return
+        fresh = {}
+        for event in books:
+            book = fresh[event.asset_id] = OrderBook()
+            book.load_snapshot(event.bids, event.asks)
+        with self.feed.dispatch_lock:
+            if self.warmed_up:
+                return  # WS snapshot landed while we were loading
+            for asset_id in fresh:
+                self._last_feed_ts.pop(asset_id, None)
+            self.orderbooks = {**self.orderbooks, **fresh}
+            self._diverged_assets.difference_update(fresh)
+            self._rest_seeded = True
+            if self.running:
+                self._mark_ready()
+                self.check_snipe_opportunity()
+
+    def presign_orders(self):
+        """Sign candidate FOK orders for both tokens ahead of the window (blocking; runs off the hot path)."""
+        if self.stopped or self.snipe_executed or not (EXECUTE_TRADES and AUTO_SNIPE):
+            return
+        limits = sorted({limit for _, target in self._tier_steps for limit in candidate_limits(target)})
+        try:
+            _presigned.prepare([self.up_token, self.down_token], limits)
+        except Exception:
+            pass  # Submission signs inline on a miss
 
-        threading.Thread(target=refresh_loop, daemon=True).start()
+    def _mark_ready(self):
+        """Book is current: allow trading, and record time-to-ready if recovering from a lost feed."""
+        self.warmed_up = True
+        since = self._recovering_since
+        if since is not None:
+            self._recovering_since = None
+            feed_health.recovery.record_ready(time.monotonic() - since)
 
     def resync_orderbook(self):
-        """Re-subscribe to get fresh orderbook data."""
-        if not self.ws or not self.running:
+        """Re-subscribe to get fresh orderbook data into shadow books.
+
+        The live books keep serving reads until every snapshot has arrived,
+        then _swap_shadow_books replaces them in one assignment.
+        """
+        if not self.running:
             return
         try:
-            # Clear current orderbook
-            self.orderbooks = {}
-            self.warmed_up = False
+            self._shadow_books = {}
+            self._shadow_deltas = {}
+            self._resync_pending = {self.up_token, self.down_token}
             self._last_resync = time.time()
+            self._cancel_resync_timer()
+            self._resync_timer = self.scheduler.call_later(RESYNC_TIMEOUT + 0.1, self.refresh)
             # Re-send subscription
-            subscribe_msg = {
-                "assets_ids": [self.up_token, self.down_token],
-                "type": "market"
-            }
-            self.ws.send(json.dumps(subscribe_msg))
-            _update_asset_status(self.asset_label, f"[{self.asset_label}]".ljust(12) + "| 🔄 Resyncing orderbook...")
+            self.feed.resubscribe([self.up_token, self.down_token])
+        except Exception:
+            self._abandon_resync()
+
+    def _abandon_resync(self):
+        """Drop a resync whose snapshots never arrived; the live book stays in place."""
+        self._cancel_resync_timer()
+        self._resync_pending = set()
+        self._shadow_books = {}
+        self._shadow_deltas = {}
+
+    def _cancel_resync_timer(self):
+        if self._resync_timer:
+            self._resync_timer.cancel()
+            self._resync_timer = None
+
+    def start(self):
+        """Subscribe our tokens on the shared feed."""
+        self._set_status("| 🔌 Subscribing to market feed...")
+        self.feed.subscribe([self.up_token, self.down_token], self)
+
+    def refresh(self):
+        """Periodic status refresh (keeps display alive when no WS messages)."""
+        try:
+            with self.feed.dispatch_lock:
+                if self.running:
+                    self.check_snipe_opportunity()
         except Exception:
             pass
 
     def run(self):
-        """Start the WebSocket connection with auto-reconnect."""
-        ws_url = f"{WS_URL}/ws/market"
-        max_retries = 10
-        retry_count = 0
-
-        while not self.stopped:
-            self.ws = WebSocketApp(
-                ws_url,
-                on_message=self.on_message,
-                on_error=self.on_error,
-                on_close=self.on_close,
-                on_open=self.on_open
-            )
+        """Subscribe to the shared feed and schedule refreshes (returns immediately).
+
+        Besides the periodic refresh, an evaluation fires at each tier
+        activation and at interval end, so window entry doesn't wait for a
+        message or the next refresh.
+        """
+        self.start()
+        offload = self.OFFLOAD_EVALUATION
+        self._refresh_timer = self.scheduler.call_every(MONITOR_REFRESH_SECS, self.refresh, offload=offload)
+        self._health_timer = self.scheduler.call_every(feed_health.CHECK_INTERVAL, self.check_feed_health, offload=offload)
+        now = clock.now()
+        for at in [start for start, _ in self._tier_steps] + [self.interval_end_unix]:
+            if at > now:
+                self._tier_timers.append(self.scheduler.call_later(at - now, self.refresh, offload=offload))
+        if self._tier_steps and self.interval_end_unix > now:
+            presign_at = self._tier_steps[0][0] - PRESIGN_LEAD
+            self._presign_timer = self.scheduler.call_later(max(0, presign_at - now), self.presign_orders, priority=True)
+            if EXECUTE_TRADES and AUTO_SNIPE:
+                validate_at = self._tier_steps[0][0] - CREDS_VALIDATE_LEAD
+                self._validate_timer = self.scheduler.call_later(max(0, validate_at - now), _credentials.ensure_valid, priority=True)
 
-            _update_asset_status(self.asset_label, f"[{self.asset_label}]".ljust(12) + "| 🔌 Connecting to WebSocket...")
-            self.ws.run_forever(ping_interval=30, ping_timeout=10)
+    def stop(self):
+        """Unsubscribe from the shared feed and cancel this monitor's timers."""
+        self.stopped = True
+        self.running = False
+        for timer in (self._refresh_timer, self._health_timer, self._presign_timer, self._validate_timer, self._conflation_timer):
+            if timer:
+                timer.cancel()
+        self._refresh_timer = self._health_timer = self._presign_timer = self._validate_timer = self._conflation_timer = None
+        for timer in self._tier_timers:
+            timer.cancel()
+        self._tier_timers = []
+        self._cancel_resync_timer()
+        self.feed.unsubscribe([self.up_token, self.down_token], self)
+        _presigned.discard([self.up_token, self.down_token])
+
+
+def fok_limit(best_ask: int) -> int:
+    """FOK limit for a best ask (ticks): whole cents, SNIPE_DEPTH_BAND above it, below MAX_PRICE_TICKS."""
+    max_limit = (MAX_PRICE_TICKS - 1) // CENT_TICKS * CENT_TICKS
+    limit = -(-best_ask // CENT_TICKS) * CENT_TICKS + price_to_ticks(SNIPE_DEPTH_BAND)
+    return min(limit, max_limit)
+
+
+def candidate_limits(target: int) -> set[int]:
+    """Every FOK limit an opportunity at tier target can produce (asks from target - epsilon up to the max)."""
+    return {fok_limit(ask) for ask in range(target - PRICE_EPSILON_TICKS, MAX_PRICE_TICKS)}
+
+
+def position_size(price: int) -> int:
+    """Shares for a full MAX_POSITION_SIZE order at price (ticks), at least the $1 minimum."""
+    return max(MAX_POSITION_SIZE * PRICE_SCALE // price, PRICE_SCALE // price + 1)
+
+
+class PresignedOrders:
+    """FOK buy orders signed before the trading window, so submission is only post_order.
+
+    Keyed by (token_id, limit price in ticks, size); the full
+    MAX_POSITION_SIZE order is signed for each candidate limit. An order is
+    only used for exactly its size (a thin book signs inline rather than
+    sending less than the depth allows). Orders are single-use (taken on
+    submission) and dropped on interval roll (discard), and on a new client
+    or a nonce/expiry rejection (invalidate).
+    """
+
+    def __init__(self):
+        self._orders = {}  # {(token_id, price, size): signed_order}
+        self._generation = 0  # Bumped by invalidate(); signatures from older generations are dropped
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def prepare(self, token_ids: list, prices: list):
+        """Sign any missing candidate orders (blocking: signing plus the client's first tick-size lookups)."""
+        client = get_trading_client()
+        with self._lock:
+            generation = self._generation
+        for token_id in token_ids:
+            for price in prices:
+                key = (token_id, price, position_size(price))
+                with self._lock:
+                    if key in self._orders:
+                        continue
+                signed = client.create_order(OrderArgs(price=ticks_to_price(price), size=key[2], side=BUY, token_id=token_id))
+                with self._lock:
+                    if generation != self._generation:
+                        return
+                    self._orders[key] = signed
+
+    def take(self, token_id: str, price: int, size: int):
+        """Remove and return the order signed for exactly this size, or None."""
+        with self._lock:
+            signed = self._orders.pop((token_id, price, size), None)
+            if signed is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return signed
+
+    def discard(self, token_ids: list):
+        """Drop orders for tokens whose market is no longer monitored."""
+        token_ids = set(token_ids)
+        with self._lock:
+            for key in [key for key in self._orders if key[0] in token_ids]:
+                del self._orders[key]
+
+    def invalidate(self):
+        """Drop every order (signer, nonce or expiry changed)."""
+        with self._lock:
+            self._generation += 1
+            self._orders = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            if not (self._orders or self.hits or self.misses):
+                return {}
+            ready = len(self._orders)
+        return {"presigned": ready, "presign hits": self.hits, "presign misses": self.misses}
+
+
+_presigned = PresignedOrders()
+
+
+class OrderIntent(NamedTuple):
+    """An order a monitor wants placed, queued for the executor."""
+    monitor: "SniperMonitor"
+    opportunity: dict
+    total_secs: int
+    target: int
+
+
+class OrderExecutor:
+    """Bounded queue of order intents drained by dedicated submission threads.
+
+    Monitors enqueue from the feed thread and return immediately, so book
+    updates keep flowing while an order (or a credential refresh) is in
+    flight; workers run execute_snipe and hand the result back to the
+    monitor. Threads start on the first submit.
+    """
+
+    def __init__(self, workers: int = ORDER_WORKERS, queue_size: int = ORDER_QUEUE_SIZE):
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, intent: OrderIntent) -> bool:
+        """Queue intent; False if the queue is full."""
+        if not self._threads:
+            self._start()
+        try:
+            self._queue.put_nowait(intent)
+            return True
+        except queue.Full:
+            return False
 
-            if self.stopped:
-                break
+    def stats(self) -> dict:
+        return {"orders queued": self._queue.qsize()} if self._threads else {}
 
-            # Only count as retry if connection failed (running was never set to True)
-            # If it ran successfully for a while then disconnected, reset the counter
-            if not self.running:
-                retry_count += 1
-            else:
-                retry_count = 0  # Reset on successful connection that later dropped
+    def _start(self):
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, daemon=True, name=f"order-{len(self._threads)}")
+                thread.start()
+                self._threads.append(thread)
 
-            if retry_count > max_retries:
-                _update_asset_status(self.asset_label, f"[{self.asset_label}]".ljust(12) + f"| ❌ Max reconnect attempts reached")
-                break
+    def _run(self):
+        while True:
+            intent = self._queue.get()
+            try:
+                intent.monitor._execute_intent(intent)
+            except Exception:
+                pass  # A failed submission must not kill the worker
 
-            wait = min(2 ** retry_count, 30)
-            _update_asset_status(self.asset_label, f"[{self.asset_label}]".ljust(12) + f"| 🔄 Reconnecting in {wait}s...")
-            time.sleep(wait)
-    
-    def stop(self):
-        """Stop the WebSocket connection permanently (no reconnect)."""
-        self.stopped = True
-        self.running = False
-        if self.ws:
-            self.ws.close()
+
+_order_executor = OrderExecutor()
+_retries_suppressed = 0  # Retries skipped by backoff or an unchanged top of book (status footer)
+_FAK = getattr(OrderType, "FAK", OrderType.FOK)  # Fill-and-kill, on clients that support it
+
+
+def _retry_stats() -> dict:
+    return {"retries suppressed": _retries_suppressed} if _retries_suppressed else {}
+
+
+def _monitor_stats() -> dict:
+    stats = {}
+    if _integrity_failures:
+        stats["book divergences"] = _integrity_failures
+    if _conflated_frames:
+        stats["evals conflated"] = _conflated_frames
+    return stats
 
 
-def execute_snipe(opportunity: dict, size: int = None, target_price: float = 0.98, monitor_label: str = None, _retry: bool = False, trade_context: dict = None) -> dict | None:
+def execute_snipe(opportunity: dict, size: int = None, target_price: int = 980, monitor_label: str = None, _retry: bool = False, trade_context: dict = None, reprice=None) -> dict | None:
     """Execute snipe trade using WebSocket prices. FOK order ensures full fill or cancel.
-    Returns dict with trade details on success, None on failure."""
+    Opportunity prices are in ticks and sizes in size units. reprice() returns the
+    current opportunity (or None), used when retrying after a credential refresh.
+    Returns dict with trade details (in dollars/shares) on success, None on failure."""
     global _balance_exhausted
     label = monitor_label or "UNKNOWN"
+    trace = opportunity.get("trace") or latency.OrderTrace()
+    trace.mark("dispatched")
+    ctx = trade_context or {}
 
     if not EXECUTE_TRADES:
         return None
@@ -709,26 +1255,23 @@ def execute_snipe(opportunity: dict, size: int = None, target_price: float = 0.9
         return None
 
     # Check liquidity before doing anything
-    available = int(opportunity.get("size", 0))
+    available = opportunity.get("size", 0) // SIZE_SCALE
     if available < 1:
         return None
 
     try:
         client = get_trading_client()
 
-        # Use WebSocket price directly - FOK ensures full fill or cancel
-        price = round(opportunity["price"], 2)
+        # Limit price from the depth query (whole cents, at or above the best
+        # ask) - FOK ensures full fill or cancel
+        price = opportunity["limit"]
 
-        # Calculate position size
+        # Calculate position size (at least the $1 minimum order value)
         if size is None:
-            size = int(MAX_POSITION_SIZE / price)
+            size = position_size(price)
+        size = max(size, PRICE_SCALE // price + 1)
 
-        # Ensure minimum order value ($1)
-        min_shares = int(1.0 / price) + 1
-        if size < min_shares:
-            size = min_shares
-
-        # Cap by available liquidity from WebSocket
+        # Cap by available liquidity up to the limit price from WebSocket
         if size > available:
             size = available
 
@@ -737,144 +1280,268 @@ def execute_snipe(opportunity: dict, size: int = None, target_price: float = 0.9
 
         # Skip if order is too small to be worth it
         cost = size * price
-        if cost < MIN_ORDER_VALUE:
+        if cost < MIN_ORDER_VALUE * PRICE_SCALE:
             return None
 
-        # Check position limit
-        if not can_open_position(cost):
+        # Reserve the exposure (check and claim in one step); released unless the order fills
+        if not reserve_exposure(label, cost):
             return None
+        resubmitting = False  # A 403 is resubmitted on this trace: only the final attempt is recorded
+        try:
+            # Use the pre-signed order if it is for exactly this size; never shrink below the depth to save a signature
+            signed_order = _presigned.take(opportunity["token_id"], price, size)
+            if signed_order is None:
+                signed_order = client.create_order(OrderArgs(
+                    price=ticks_to_price(price),
+                    size=size,
+                    side=BUY,
+                    token_id=opportunity["token_id"]
+                ))
+            trace.mark("signed")
+
+            partial = opportunity.get("partial", False)
+            with _market_lock(label):
+                trace.mark("sent")
+                try:
+                    result = client.post_order(signed_order, _FAK if partial else OrderType.FOK)
+                finally:
+                    trace.mark("acked")
+
+            success = result.get("success", False)
+            order_id = result.get("orderID", "")
+            if success and partial:
+                # Fill-and-kill may fill only part: takingAmount is the shares received on a buy
+                size = min(size, int(float(result.get("takingAmount") or size)))
+                cost = size * price
+                success = size > 0
+
+            # Log the trade with context
+            log_trade(label, opportunity["side"], price, size, success, order_id,
+                      time_remaining=ctx.get("time_remaining"),
+                      target_price=ctx.get("target_price"), trace=trace)
+
+            # Record position if successful
+            if success:
+                commit_position(label, opportunity["side"], size, price)
+                return {"price": ticks_to_price(price), "size": size, "cost": ticks_to_price(cost), "payout": size}
 
-        # Create and execute order
-        order = OrderArgs(
-            price=price,
-            size=size,
-            side=BUY,
-            token_id=opportunity["token_id"]
-        )
-
-        with _trade_lock:
-            signed_order = client.create_order(order)
-            result = client.post_order(signed_order, OrderType.FOK)
-
-        success = result.get("success", False)
-        order_id = result.get("orderID", "")
-
-        # Log the trade with context
-        ctx = trade_context or {}
-        log_trade(monitor_label or "UNKNOWN", opportunity["side"], price, size, success, order_id,
-                  time_remaining=ctx.get("time_remaining"),
-                  target_price=ctx.get("target_price"))
-
-        # Record position if successful
-        if success:
-            record_position(monitor_label or "UNKNOWN", opportunity["side"], size, price)
-            return {"price": price, "size": size, "cost": cost, "payout": size}
-
-        return None
+            return None
+        except Exception as e:
+            resubmitting = "403" in str(e) and not _retry
+            raise
+        finally:
+            release_exposure(label)
+            if "acked" in trace and not resubmitting:
+                latency.histograms.record(label, ctx.get("time_remaining"), trace)
 
     except Exception as e:
         error_str = str(e)
-        # On 403 error, refresh credentials and retry once
+        error_lower = error_str.lower()
+        if "nonce" in error_lower or "expir" in error_lower:
+            _presigned.invalidate()  # Pre-signed orders carry the rejected nonce/expiration
+        # On 403 error, refresh credentials and retry once (the background refresh makes this rare)
         if "403" in error_str and not _retry:
-            get_trading_client(force_refresh=True)
+            _credentials.refresh(validate=False)
+            if reprice is not None:
+                opportunity = reprice()  # The book kept updating during the refresh: retry at current prices
+                if opportunity is None:
+                    return None
+                opportunity["trace"] = trace  # Keep received/applied/detected: latency is measured end to end
             return execute_snipe(opportunity, size, target_price, monitor_label, _retry=True, trade_context=trade_context)
         # Ping @everyone for insufficient funds or balance errors
-        error_lower = error_str.lower()
         if any(kw in error_lower for kw in ["insufficient", "balance", "fund", "allowance"]):
             _balance_exhausted = True
             send_discord_notification(
                 f"🚨 INSUFFICIENT FUNDS - {label}",
-                f"**Error:** {error_str[:200]}\n**Side:** {opportunity.get('side', '?')}\n**Price:** ${opportunity.get('price', 0):.2f}\n\n**Trading halted** until next interval. Claim winnings to resume.",
+                f"**Error:** {error_str[:200]}\n**Side:** {opportunity.get('side', '?')}\n**Price:** ${ticks_to_price(opportunity.get('price', 0)):.2f}\n\n**Trading halted** until next interval. Claim winnings to resume.",
                 color=0xff0000,
                 ping_everyone=True,
             )
         return None
 
 
-def monitor_asset(asset: str, interval_minutes: int = 15):
-    """Monitor loop for a single asset+interval. Runs in its own thread."""
-    label = f"{asset.upper()}-{interval_minutes}M"
-    interval_seconds = interval_minutes * 60
-    current_slug = None
-    monitor = None
+def _find_open_market(slug: str) -> tuple[dict | None, str]:
+    """Fetch a slug's event. Returns (open market, "") or (None, waiting status)."""
+    return _open_market_from_event(fetch_market_by_slug(slug))
+
+
+def _open_market_from_event(event_data: dict | None) -> tuple[dict | None, str]:
+    """Pick the open market from a Gamma event. Returns (open market, "") or (None, waiting status)."""
+    if not event_data:
+        return None, "⏳ Waiting for market..."
+
+    markets = event_data.get("markets", [])
+    if not markets:
+        return None, "⏳ No markets in event..."
+
+    # Get open market
+    open_markets = [m for m in markets if not m.get('closed', False)]
+    if not open_markets:
+        return None, "⏳ Market closed, waiting..."
+    return open_markets[0], ""
+
+
+class AssetMonitor:
+    """Interval lifecycle for a single asset+interval, driven by a once-a-second tick.
 
-    while True:
+    At each boundary the new interval's market is resolved and monitored. In
+    the last PRESUBSCRIBE_LEAD seconds of each interval the next interval's
+    market is resolved and subscribed in standby, then promoted at the boundary.
+
+    A tick is begin() (roll over, decide what to resolve), the Gamma lookup,
+    then finish() (start the monitor). Here ticks run on the scheduler's
+    worker pool (lookups block) and never overlap; engine.py calls begin()
+    and finish() on its event loop and runs only the lookup in a thread.
+    """
+
+    def __init__(self, asset: str, interval_minutes: int = 15, scheduler: Scheduler = None, feed: MarketFeed = None,
+                 monitor_cls: type = SniperMonitor):
+        self.asset = asset
+        self.interval_minutes = interval_minutes
+        self.label = f"{asset.upper()}-{interval_minutes}M"
+        self.interval_seconds = interval_minutes * 60
+        self.scheduler = scheduler or get_scheduler()
+        self.feed = feed  # None: the shared threaded feed
+        self.monitor_cls = monitor_cls
+        self.current_slug = None
+        self.interval_end_unix = 0
+        self.monitor = None
+        self.next_monitor = None  # Standby monitor for the upcoming interval
+        self.timer = None
+        self._retry_at = 0          # Back off after a failed lookup or error
+        self._standby_retry_at = 0  # Back off between standby lookups
+
+    def start(self, first_delay: float = 0.0):
+        self.timer = self.scheduler.call_every(1, self.tick, offload=True, first_delay=first_delay)
+
+    def stop(self):
+        if self.timer:
+            self.timer.cancel()
+        for monitor in (self.monitor, self.next_monitor):
+            if monitor:
+                monitor.stop()
+
+    def tick(self):
+        """Roll to a new interval at the boundary; pre-subscribe the next one near it."""
+        slug = self.begin()
+        if slug:
+            self.finish(slug, *_find_open_market(slug))
+
+    def begin(self) -> str | None:
+        """Roll over at the boundary (non-blocking). Returns the slug whose market finish() needs, if any."""
+        now = clock.now()
+        if now < self._retry_at:
+            return None
         try:
-            slug = generate_market_slug(asset, interval_minutes)
-
-            # Check if we moved to a new interval
-            if slug != current_slug:
-                # New interval — reset balance halt (user may have claimed winnings)
-                global _balance_exhausted
-                _balance_exhausted = False
-
-                # Clear position from previous interval (it has resolved)
-                clear_position(label)
-
-                # Stop old monitor
-                if monitor:
-                    monitor.stop()
-                    time.sleep(1)
-
-                current_slug = slug
-                # Calculate minutes remaining from slug timestamp
-                slug_timestamp = int(slug.split("-")[-1])
-                interval_end_unix = slug_timestamp + interval_seconds
-                minutes_left = max(0, (interval_end_unix - int(time.time())) / 60)
-                _update_asset_status(label, f"[{label}]".ljust(12) + f"| 🆕 New interval | Closes in {minutes_left:.1f}min")
-
-                # Fetch market data
-                event_data = fetch_market_by_slug(slug)
-
-                if not event_data:
-                    _update_asset_status(label, f"[{label}]".ljust(12) + "| ⏳ Waiting for market...")
-                    time.sleep(5)
-                    current_slug = None  # Reset to retry
-                    continue
-
-                markets = event_data.get("markets", [])
-                if not markets:
-                    _update_asset_status(label, f"[{label}]".ljust(12) + "| ⏳ No markets in event...")
-                    time.sleep(5)
-                    current_slug = None
-                    continue
-
-                # Get open market
-                open_markets = [m for m in markets if not m.get('closed', False)]
-                if not open_markets:
-                    _update_asset_status(label, f"[{label}]".ljust(12) + "| ⏳ Market closed, waiting...")
-                    time.sleep(5)
-                    current_slug = None
-                    continue
-
-                market = open_markets[0]
-                _update_asset_status(label, f"[{label}]".ljust(12) + f"| ✅ Found market, connecting...")
-
-                # Start WebSocket monitor (interval_end_unix already calculated above)
-                monitor = SniperMonitor(market, asset_label=label, interval_end_unix=interval_end_unix, asset_name=asset, interval_minutes=interval_minutes, slug=current_slug)
-                ws_thread = threading.Thread(target=monitor.run, daemon=True)
-                ws_thread.start()
-
-                # Monitor thread and check for interval end
-                while ws_thread.is_alive():
-                    new_slug = generate_market_slug(asset, interval_minutes)
-                    if new_slug != current_slug:
-                        _update_asset_status(label, f"[{label}]".ljust(12) + "| 🔄 Interval ended, switching...")
-                        monitor.stop()
-                        break
-                    time.sleep(1)
-            else:
-                time.sleep(5)
+            slug = generate_market_slug(self.asset, self.interval_minutes)
+            if slug != self.current_slug:
+                return self._roll(slug)
+            if self.next_monitor is None and self.interval_end_unix - now <= PRESUBSCRIBE_LEAD and now >= self._standby_retry_at:
+                return generate_market_slug(self.asset, self.interval_minutes, timestamp=self.interval_end_unix)
+        except Exception as e:
+            self._fail(e)
+        return None
 
+    def finish(self, slug: str, market: dict | None, waiting_status: str):
+        """Monitor the market begin() asked for: the current interval's, or the next one's in standby."""
+        try:
+            if slug != self.current_slug:
+                # Subscribe the next interval in standby so its book is warm at the boundary
+                if market:
+                    self.next_monitor = self._new_monitor(market, slug, self.interval_end_unix + self.interval_seconds, standby=True)
+                else:
+                    self._standby_retry_at = clock.now() + 5
+                return
+
+            if not market:
+                self._set_status(f"| {waiting_status}")
+                self.current_slug = None  # Reset to retry
+                self._retry_at = clock.now() + 5
+                return
+
+            self._set_status(f"| ✅ Found market, connecting...")
+
+            # Start monitor on the shared feed
+            self.monitor = self._new_monitor(market, slug, self.interval_end_unix)
         except Exception as e:
-            _update_asset_status(label, f"[{label}]".ljust(12) + f"| ❌ Error: {str(e)[:30]}")
-            time.sleep(5)
+            self._fail(e)
+
+    def _roll(self, slug: str) -> str | None:
+        """Start the interval identified by slug. Returns slug if its market still has to be looked up."""
+        # New interval — reset balance halt (user may have claimed winnings)
+        global _balance_exhausted
+        _balance_exhausted = False
+
+        # Clear position from previous interval (it has resolved)
+        clear_position(self.label)
+
+        self.current_slug = slug
+        # Calculate minutes remaining from slug timestamp
+        self.interval_end_unix = int(slug.split("-")[-1]) + self.interval_seconds
+        self._standby_retry_at = 0
+
+        if self.next_monitor and self.next_monitor.slug == slug:
+            # Pre-subscribed during the previous interval: hand over with a warm book
+            if self.monitor:
+                self.monitor.stop()
+            self.monitor, self.next_monitor = self.next_monitor, None
+            self.monitor.promote()
+            return None
+
+        # Stop old monitors
+        for old in (self.monitor, self.next_monitor):
+            if old:
+                old.stop()
+        self.monitor = self.next_monitor = None
+
+        minutes_left = clock.seconds_until(self.interval_end_unix) / 60
+        self._set_status(f"| 🆕 New interval | Closes in {minutes_left:.1f}min")
+        return slug
+
+    def _new_monitor(self, market: dict, slug: str, interval_end_unix: int, standby: bool = False) -> SniperMonitor:
+        monitor = self.monitor_cls(market, asset_label=self.label, interval_end_unix=interval_end_unix, asset_name=self.asset, interval_minutes=self.interval_minutes, slug=slug, feed=self.feed, standby=standby, scheduler=self.scheduler)
+        monitor.run()
+        return monitor
+
+    def _set_status(self, message: str):
+        _update_asset_status(self.label, f"[{self.label}]".ljust(12) + message)
+
+    def _fail(self, error: Exception):
+        self._set_status(f"| ❌ Error: {str(error)[:30]}")
+        self._retry_at = clock.now() + 5
+
+
+def render_status(scheduler, feed, *sources):
+    """Redraw the status table from published snapshots at STATUS_REFRESH_HZ (blocks; the renderer's own thread).
+
+    The footer shows the scheduler's, cache's and feed's stats(), plus those of any extra sources.
+    """
+    with Live(_build_status_table(), console=_console, refresh_per_second=STATUS_REFRESH_HZ, transient=False) as live:
+        while True:
+            try:
+                stats = {**scheduler.stats(), **market_cache.get_cache().stats(), **feed.stats(), **feed_health.recovery.stats(),
+                         **_presigned.stats()}
+                for source in sources:
+                    stats.update(source.stats())
+                stats.update({**_credentials.stats(), **latency.histograms.stats(), **_retry_stats(), **_monitor_stats()})
+                live.update(_build_status_table(stats))
+            except Exception:
+                pass  # Ignore display errors
+            time.sleep(1 / STATUS_REFRESH_HZ)
+
+
+def print_stopped():
+    """Ctrl+C banner, with the order latency report if any orders were sent."""
+    print(f"\n\n{'='*70}")
+    print("🛑 MONITORING STOPPED")
+    print(f"{'='*70}")
+    report = latency.histograms.summary()
+    if report:
+        print(f"\n{report}\n")
 
 
 def monitor_all_assets():
     """Main entry point: monitor all configured assets in parallel."""
-    global _live, _all_connected
-
     # Startup banner
     print(f"\n{'='*70}")
     print(f"🎯 MULTI-ASSET RESOLUTION SNIPER (WebSocket)")
@@ -901,13 +1568,24 @@ def monitor_all_assets():
             print(f"❌ Failed to init trading client: {e}\n")
         sys.stdout.flush()
 
-    # Start one thread per asset+interval
-    threads = []
-    for asset, interval in MONITORED_ASSETS:
-        t = threading.Thread(target=monitor_asset, args=(asset, interval), daemon=True)
-        t.start()
-        threads.append(t)
-        time.sleep(0.5)  # Stagger starts to avoid API burst
+    # Align interval countdowns with the venue's clock, and keep them aligned
+    scheduler = get_scheduler()
+    if EXECUTE_TRADES:
+        _credentials.start(scheduler)
+    offset = clock.sync_server_time(f"{CLOB_HOST}/time")
+    if offset is None:
+        print("⚠️ Could not reach CLOB server time, using local clock\n")
+    else:
+        print(f"🕒 Server clock offset: {offset * 1000:+.0f} ms\n")
+    scheduler.call_every(clock.SYNC_INTERVAL, clock.sync_server_time, f"{CLOB_HOST}/time", offload=True)
+
+    # Resolve current and upcoming intervals in the background so boundaries hit a warm cache
+    cache = market_cache.get_cache()
+    scheduler.call_every(market_cache.PREFETCH_INTERVAL, cache.prefetch, MONITORED_ASSETS, offload=True, first_delay=0)
+
+    # One scheduler tick per asset+interval (no thread per market)
+    for i, (asset, interval) in enumerate(MONITORED_ASSETS):
+        AssetMonitor(asset, interval, scheduler).start(first_delay=0.5 * i)  # Stagger starts to avoid API burst
 
     # Wait for all WebSockets to connect (with progress)
     print("⏳ Connecting to markets...")
@@ -923,23 +1601,18 @@ def monitor_all_assets():
         if wait_time % 10 == 0 and wait_time > 0:
             print(f"   Still waiting... ({_connected_count}/{_expected_connections} connected)")
             # Show what each asset is doing
-            for label, status in _asset_status.items():
-                print(f"   {status}")
+            for snap in list(_asset_status.values()):
+                print(f"   {_format_status(snap)}")
 
-    print(f"\n✅ All {_expected_connections} WebSockets connected!\n")
-    _all_connected = True
+    redundant = " (each market on 2+, first arrival wins)" if FEED_REDUNDANCY > 1 else ""
+    print(f"\n✅ All {_expected_connections} markets subscribed on {max(FEED_CONNECTIONS, FEED_REDUNDANCY)} WebSocket connection(s){redundant}!\n")
 
-    # Main thread runs the display
+    # Main thread is the renderer: it redraws from published snapshots at a
+    # fixed rate, so monitors never wait on terminal output
     try:
-        with Live(_build_status_table(), console=_console, refresh_per_second=2, transient=False) as live:
-            _live = live
-            while True:
-                time.sleep(0.5)
+        render_status(scheduler, _market_feed, _order_executor)
     except KeyboardInterrupt:
-        _live = None
-        print(f"\n\n{'='*70}")
-        print("🛑 MONITORING STOPPED")
-        print(f"{'='*70}")
+        print_stopped()
 
 
 def main():